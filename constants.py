@@ -1,15 +1,24 @@
 import asyncio
+import hashlib
 import json
 import logging
 import os
-from string import ascii_lowercase
-from typing import List, Dict, Set, Optional
+import sys
+import tempfile
+from collections import defaultdict, Counter
+from datetime import datetime
+from typing import Dict, Optional, Any, List, Set, Tuple, DefaultDict
 
 import aiohttp
 import asyncpg
 from aiogram import Bot, Dispatcher, types
 from aiogram.dispatcher.filters import BoundFilter
 
+import words
+from definitions import Definitions
+from timers import TimerWheel
+from words import WordIndex, WordSampler, WordOverlay, Alphabet, ALPHABETS
+
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,6 +45,48 @@ OFFICIAL_GROUP_ID = config["OFFICIAL_GROUP_ID"]
 WORD_ADDITION_CHANNEL_ID = config["WORD_ADDITION_CHANNEL_ID"]
 VIP = config["VIP"]
 VIP_GROUP = config["VIP_GROUP"]
+# Prebuilt word indexes loaded on first use and rewritten after every successful update_words,
+# formatted with the language code
+WORDS_SNAPSHOT_PATH = config.get("WORDS_SNAPSHOT_PATH", "words.{}.snapshot")
+# Also download the word list at startup when a snapshot was loaded
+REFRESH_WORDS_ON_STARTUP = config.get("REFRESH_WORDS_ON_STARTUP", False)
+WORDS_REFRESH_INTERVAL = config.get("WORDS_REFRESH_INTERVAL_HOURS", 24) * 3600
+# "builder" downloads the word lists and publishes snapshots,
+# "worker" only attaches to the snapshots published by the builder process running on the same host
+WORDS_ROLE = config.get("WORDS_ROLE", "builder")
+WORDS_WATCH_INTERVAL = config.get("WORDS_WATCH_INTERVAL_SECONDS", 30)  # How often workers check for new snapshots
+WORDLIST_CHANNEL = "wordlist_changed"  # Notified with the language after word commands change the wordlist table
+# Notified with the group id and language after group word commands change the groupwordlist table
+GROUP_WORDLIST_CHANNEL = "groupwordlist_changed"
+# Word list of each language games can be played in, languages need an alphabet in words.ALPHABETS
+WORD_LIST_URLS = {
+    "en": "https://raw.githubusercontent.com/dwyl/english-words/master/words.txt",
+    **config.get("WORD_LIST_URLS", {}),
+}
+# Language of word commands, inline queries and games started without a language argument
+DEFAULT_LANGUAGE = config.get("DEFAULT_LANGUAGE", "en")
+if set(WORD_LIST_URLS) - set(ALPHABETS):
+    raise ValueError(
+        f"No alphabet for languages in WORD_LIST_URLS: {', '.join(sorted(set(WORD_LIST_URLS) - set(ALPHABETS)))}, "
+        f"supported languages are {', '.join(ALPHABETS)}"
+    )
+if DEFAULT_LANGUAGE not in WORD_LIST_URLS:
+    raise ValueError(f"DEFAULT_LANGUAGE {DEFAULT_LANGUAGE} has no word list in WORD_LIST_URLS")
+# Words of themed games, one word per line in <language>/<theme>.txt
+THEMES_PATH = config.get("THEMES_PATH", "themes")
+# Strings words chosen by the bot must not contain, one per line, formatted with the language code
+# Applied when the word index is built, see words.build_blocklist
+BLOCKLIST_PATH = config.get("BLOCKLIST_PATH", "blocklist.{}.txt")
+# Definitions files of /define built with definitions.py, formatted with the language code, no network is used
+DEFINITIONS_PATH = config.get("DEFINITIONS_PATH", "definitions.{}.dat")
+DEFINITION_MAX_LENGTH = 3000  # Characters of definitions shown by /define
+INLINE_RESULTS_PER_PAGE = 50  # Maximum allowed by Telegram
+INLINE_CACHE_TIME = 600  # Seconds inline results may be cached by Telegram
+INLINE_PAGE_CACHE_SIZE = 1024  # Rendered inline result pages kept in memory
+WORD_IMPORT_BATCH_SIZE = 10000  # Words copied to the database at a time by imports of uploaded word lists
+WORD_MERGE_BATCH_SIZE = 5000  # Words added to a word index between yields to the event loop, see add_words
+# How often word usage counts are written to the database, word samplers are rebuilt from them at the same time
+WORD_USAGE_FLUSH_INTERVAL = config.get("WORD_USAGE_FLUSH_INTERVAL_SECONDS", 300)
 
 loop = asyncio.get_event_loop()
 BOT_ID = int(TOKEN.partition(":")[0])
@@ -43,56 +94,394 @@ ON9BOT_ID = int(ON9BOT_TOKEN.partition(":")[0])
 bot = Bot(TOKEN, loop, parse_mode=types.ParseMode.MARKDOWN)
 ON9BOT = Bot(ON9BOT_TOKEN, loop)
 dp = Dispatcher(bot)
+timer_wheel = TimerWheel(loop)  # Joining phase and turn deadlines of all games, see ClassicGame.on_timer
 
 GAMES: Dict[int, "ClassicGame"] = {}  # Group id mapped to game instance
 pool: Optional[asyncpg.pool.Pool] = None
 session: Optional[aiohttp.ClientSession] = None
-WORDS_ALL: List[str] = []  # List of all words
-WORDS_LI: Dict[str, List[str]] = {}  # Letter mapped to list of words starting with letter
-WORDS: Dict[str, Set[str]] = {}  # Letter mapped to set of words starting with letter
-
-
-def get_words_all() -> List[str]:
-    return WORDS_ALL
-
-
-def get_words_set() -> Dict[str, Set[str]]:
-    return WORDS
-
-
-def get_words_li() -> Dict[str, List[str]]:
-    return WORDS_LI
-
-
-async def update_words() -> None:
-    global WORDS_ALL, WORDS_LI, WORDS
-
-    # Retrieve words from online repo and table of added words in db
-    logger.info("Kelimeleri alma")
-    async with session.get("https://raw.githubusercontent.com/dwyl/english-words/master/words.txt") as resp:
-        wordlist = (await resp.text()).splitlines()
+wordlist_listener: Optional[asyncpg.Connection] = None  # Receives WORDLIST_CHANNEL notifications
+# Compact word index of each loaded language, see words.py
+# Only the default language is loaded at startup, other languages when their first game starts.
+DICTIONARIES: Dict[str, WordIndex] = {}
+WORDS_MANIFESTS: Dict[str, Dict[str, Any]] = {}  # Source manifest of the snapshot each index was loaded from
+# Rejected words mapped to the reason, kept current by word commands
+REJECTED_WORDS: DefaultDict[str, Dict[str, Optional[str]]] = defaultdict(dict)
+# Words requested since startup and not added or rejected yet
+PENDING_WORDS: DefaultDict[str, Set[str]] = defaultdict(set)
+words_snapshot_stats: Dict[str, Tuple[int, int]] = {}  # Inode and mtime of the snapshot each index was loaded from
+words_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)  # Held while an index is loaded or built
+# Answers of players since usage counts were last written to the database, per language
+WORD_USAGE: DefaultDict[str, Counter] = defaultdict(Counter)
+WORD_SAMPLERS: Dict[str, WordSampler] = {}  # Samplers by usage counts of loaded languages with any usage
+# Word list changes of groups that played or changed their words since startup, by group id and language
+GROUP_OVERLAYS: Dict[Tuple[int, str], WordOverlay] = {}
+DEFINITIONS: Dict[str, Definitions] = {}  # Definitions files opened by /define, by language
+
+
+def get_words(language: str = DEFAULT_LANGUAGE) -> WordIndex:
+    # Index must be loaded, see ensure_words
+    return DICTIONARIES[language]
+
+
+def get_word_sampler(language: str = DEFAULT_LANGUAGE) -> Optional[WordSampler]:
+    return WORD_SAMPLERS.get(language)
+
+
+def get_definitions(language: str = DEFAULT_LANGUAGE) -> Optional[Definitions]:
+    # Opened on first use, only the header is read, returns None if the language has no definitions file
+    if language not in DEFINITIONS:
+        path = DEFINITIONS_PATH.format(language)
+        try:
+            DEFINITIONS[language] = Definitions(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Definitions file {path} not loaded: {e}")
+            return None
+    return DEFINITIONS[language]
+
+
+def get_snapshot_path(language: str) -> str:
+    return WORDS_SNAPSHOT_PATH.format(language)
+
+
+def get_blocklist_hash(language: str) -> Optional[str]:
+    # SHA-256 of the blocklist file of a language, None if it has none
+    try:
+        with open(BLOCKLIST_PATH.format(language), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def get_themes(language: str = DEFAULT_LANGUAGE) -> List[str]:
+    try:
+        return sorted(name[:-4] for name in os.listdir(os.path.join(THEMES_PATH, language)) if name.endswith(".txt"))
+    except OSError:
+        return []
+
+
+def load_theme(words: WordIndex, theme: str) -> None:
+    # Tag the words of a theme in an index, the word list of the theme is not kept
+    alphabet = words.alphabet
+    with open(os.path.join(THEMES_PATH, alphabet.language, theme + ".txt"), encoding="utf-8") as f:
+        words.set_tag(theme, (w for w in (alphabet.normalize(line.strip()) for line in f) if alphabet.is_word(w)))
+
+
+def normalize_lines(lines: List[bytes], alphabet: Alphabet) -> str:
+    # Keep words consisting of letters of the alphabet only and make them lowercase, one word per line
+    words = (alphabet.normalize(line.decode(errors="ignore").strip()) for line in lines)
+    return "".join(w + "\n" for w in words if alphabet.is_word(w))
+
+
+async def update_words(language: str = DEFAULT_LANGUAGE, force: bool = False) -> bool:
+    # Rebuild the word index of a language from the online repo and the table of added words in db
+    # The download is skipped if the online word list is unchanged since the current index was built,
+    # unless the blocklist changed since then, since unsafe words are only found when building.
+    # Returns whether the index was replaced.
+    url = WORD_LIST_URLS[language]
+    alphabet = ALPHABETS[language]
+    headers = {}
+    current_manifest = WORDS_MANIFESTS.get(language, {})
+    upstream_source = current_manifest.get("sources", [{}])[0]
+    blocklist_hash = get_blocklist_hash(language)
+    if language in WORDS_MANIFESTS and blocklist_hash != current_manifest.get("blocklist_sha256"):
+        logger.info(f"Blocklist changed ({language})")
+        force = True
+    if not force and upstream_source.get("etag"):
+        headers["If-None-Match"] = upstream_source["etag"]
+    if not force and upstream_source.get("last_modified"):
+        headers["If-Modified-Since"] = upstream_source["last_modified"]
+
+    logger.info(f"Kelimeleri alma ({language})")
+    fd, words_path = tempfile.mkstemp(suffix=".txt")
+    removed_path = None
+    try:
+        # Normalize the word list while streaming it to a file instead of holding it in memory
+        with open(fd, "w", encoding="utf-8") as f:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    logger.info(f"Word list unchanged ({language})")
+                    return False
+                resp.raise_for_status()
+                line_count = 0
+                rest = b""
+                async for chunk in resp.content.iter_chunked(1 << 16):
+                    lines = (rest + chunk).split(b"\n")
+                    rest = lines.pop()  # Incomplete last line
+                    line_count += len(lines)
+                    f.write(normalize_lines(lines, alphabet))
+                f.write(normalize_lines([rest], alphabet))
+                upstream_source = {
+                    "url": url,
+                    "lines": line_count + bool(rest),
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+
+            # Accepted words are added to the list and rejected words removed from it
+            async with pool.acquire() as conn:
+                res = await conn.fetch("SELECT word, accepted FROM wordlist WHERE language = $1;", language)
+            f.write("".join(row["word"] + "\n" for row in res if row["accepted"]))
+        # Created only once the download succeeded, its descriptor is closed by open
+        removed_fd, removed_path = tempfile.mkstemp(suffix=".txt")
+        with open(removed_fd, "w", encoding="utf-8") as f:
+            f.write("".join(row["word"] + "\n" for row in res if not row["accepted"]))
+
+        # Build in a separate process so that games keep running
+        logger.info("Kelime işleniyor")
+        manifest = {
+            "built_at": datetime.now().replace(microsecond=0).isoformat(),
+            "sources": [upstream_source, {"table": "wordlist", "rows": len(res)}],
+            "blocklist_sha256": blocklist_hash,
+        }
+        blocklist_args = ["--blocklist", BLOCKLIST_PATH.format(language)] if blocklist_hash else []
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, words.__file__, words_path, get_snapshot_path(language),
+            "--removed", removed_path, "--manifest", json.dumps(manifest), "--language", language, *blocklist_args,
+            stdout=asyncio.subprocess.DEVNULL,
+        )
+        if await proc.wait():
+            raise RuntimeError(f"Word snapshot build failed with exit code {proc.returncode}")
+    finally:
+        os.remove(words_path)
+        if removed_path:
+            os.remove(removed_path)
+    return await load_words_snapshot(language)
+
+
+async def load_words_snapshot(language: str = DEFAULT_LANGUAGE) -> bool:
+    # Returns whether a valid snapshot was loaded
+    path = get_snapshot_path(language)
+    try:
+        stat = os.stat(path)
+        words, manifest = WordIndex.load(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Word snapshot not loaded: {e}")
+        return False
+    if words.alphabet.language != language:
+        logger.warning(f"Word snapshot {path} is for language {words.alphabet.language}")
+        return False
+
+    # Words added or deleted after the snapshot was built are only recorded in the wordlist table
+    await apply_wordlist(words)
+
+    # Swap in the new index only once it is complete
+    # Versions keep increasing across reloads so that caches keyed on the version are never stale
+    if language in DICTIONARIES:
+        words.version = DICTIONARIES[language].version + 1
+        for theme in DICTIONARIES[language].tags:  # Themes of running games
+            load_theme(words, theme)
+    DICTIONARIES[language], WORDS_MANIFESTS[language] = words, manifest
+    words_snapshot_stats[language] = (stat.st_ino, stat.st_mtime_ns)
+    logger.info(f"Loaded {manifest['word_count']} {language} words from snapshot built at {manifest['built_at']}")
+    return True
+
+
+async def ensure_words(language: str) -> WordIndex:
+    # Load the word index of a language, building its snapshot first if there is none yet
+    # Raises if the word list cannot be downloaded or built.
+    async with words_locks[language]:
+        if language in DICTIONARIES:
+            return DICTIONARIES[language]
+        if not await load_words_snapshot(language):
+            # Workers build missing snapshots of languages too since the builder only builds languages it plays
+            await update_words(language, force=True)
+        if language not in DICTIONARIES:
+            raise RuntimeError(f"No word index could be built or loaded for language {language}")
+        await load_word_sampler(language)
+    return DICTIONARIES[language]
+
+
+async def rebuild_words(language: str = DEFAULT_LANGUAGE) -> None:
+    # Build a new snapshot even if the online word list is unchanged,
+    # so that many words added at runtime are packed into the index instead of kept in its delta
+    try:
+        async with words_locks[language]:
+            await update_words(language, force=True)
+    except Exception:
+        logger.exception(f"Word snapshot rebuild failed ({language})")
+
+
+async def add_words(words: WordIndex, words_to_add: List[str]) -> None:
+    # Add words to an index in batches so that games keep running while large imports are merged
+    for i in range(0, len(words_to_add), WORD_MERGE_BATCH_SIZE):
+        words.add_words(words_to_add[i:i + WORD_MERGE_BATCH_SIZE])
+        await asyncio.sleep(0)
+
+
+async def apply_wordlist(words: WordIndex) -> List[str]:
+    # Apply added and rejected words of the wordlist table to an index, returns the words removed from it
+    language = words.alphabet.language
+    async with pool.acquire() as conn:
+        res = await conn.fetch("SELECT word, accepted, reason FROM wordlist WHERE language = $1;", language)
+    await add_words(words, [row["word"] for row in res if row["accepted"]])
+    removed = words.remove_words(row["word"] for row in res if not row["accepted"])
+    REJECTED_WORDS[language].clear()
+    REJECTED_WORDS[language].update((row["word"], row["reason"]) for row in res if not row["accepted"])
+    PENDING_WORDS[language].difference_update(row["word"] for row in res)
+    return removed
+
+
+async def sync_wordlist(language: str) -> None:
+    # Apply changes made to the wordlist table by word commands of any bot process
+    if language not in DICTIONARIES:
+        return
+    for word in await apply_wordlist(DICTIONARIES[language]):
+        for game in GAMES.values():
+            if game.language == language:
+                game.remove_from_word_pools(word)
+
+
+async def get_overlay(group_id: int, language: str = DEFAULT_LANGUAGE) -> WordOverlay:
+    # Loaded from the database on first use, then kept current by group word commands
+    if (group_id, language) not in GROUP_OVERLAYS:
+        await load_overlay(group_id, language)
+    return GROUP_OVERLAYS[group_id, language]
+
+
+async def load_overlay(group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+    # Overlays are updated in place since running games hold them
+    async with pool.acquire() as conn:
+        res = await conn.fetch(
+            "SELECT word, accepted FROM groupwordlist WHERE group_id = $1 AND language = $2;", group_id, language
+        )
+    overlay = GROUP_OVERLAYS.setdefault((group_id, language), WordOverlay())
+    overlay.added = {row["word"] for row in res if row["accepted"]}
+    overlay.removed = {row["word"] for row in res if not row["accepted"]}
+
+
+async def sync_overlay(payload: str) -> None:
+    # Apply changes made to the groupwordlist table by group word commands of any bot process
+    group_id, language = payload.split()
+    if (int(group_id), language) not in GROUP_OVERLAYS:
+        return
+    await load_overlay(int(group_id), language)
+    game = GAMES.get(int(group_id))
+    if game and game.language == language:
+        game.word_pools.clear()  # Rebuilt with the current overlay
+
+
+async def notify_group_wordlist_changed(group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
     async with pool.acquire() as conn:
-        res = await conn.fetch("NEREDE kabul edilen kelime listesinden kelime SEÇİN;")
-        wordlist += [row[0] for row in res]
+        await conn.execute("SELECT pg_notify($1, $2);", GROUP_WORDLIST_CHANNEL, f"{group_id} {language}")
 
-    # Remove non-alphabetical words and make every word lowercase
-    logger.info("Kelime işleniyor")
-    wordlist = [w.lower() for w in wordlist if w.isalpha()]
-    # Sort and remove duplicates
-    WORDS_ALL = sorted(set(wordlist))
 
-    WORDS_LI = {i: [] for i in ascii_lowercase}
-    for w in WORDS_ALL:
-        WORDS_LI[w[0]].append(w)
-    WORDS = {i: set(WORDS_LI[i]) for i in ascii_lowercase}
+async def notify_wordlist_changed(language: str = DEFAULT_LANGUAGE) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute("SELECT pg_notify($1, $2);", WORDLIST_CHANNEL, language)
+
+
+async def watch_words_snapshot() -> None:
+    # Reload snapshots in worker processes after the builder replaces them
+    while True:
+        await asyncio.sleep(WORDS_WATCH_INTERVAL)
+        for language in list(DICTIONARIES):
+            try:
+                stat = os.stat(get_snapshot_path(language))
+            except OSError:
+                continue
+            if (stat.st_ino, stat.st_mtime_ns) != words_snapshot_stats.get(language):
+                async with words_locks[language]:
+                    await load_words_snapshot(language)
+
+
+async def flush_word_usage() -> Dict[str, Set[str]]:
+    # Add the usage counts collected since the last flush to the wordusage table,
+    # returns the starting letters of the flushed words by language
+    # Rows are copied to a temporary table first since COPY cannot update existing rows.
+    records = [(w, language, c) for language, usage in WORD_USAGE.items() for w, c in usage.items()]
+    if not records:
+        return {}
+    WORD_USAGE.clear()
+    try:
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute("CREATE TEMPORARY TABLE wordusage_delta (LIKE wordusage) ON COMMIT DROP;")
+            await conn.copy_records_to_table("wordusage_delta", records=records, columns=["word", "language", "count"])
+            await conn.execute(
+                """\
+                INSERT INTO wordusage SELECT * FROM wordusage_delta
+                ON CONFLICT (word, language) DO UPDATE SET count = wordusage.count + excluded.count;"""
+            )
+    except Exception:
+        for word, language, count in records:  # Retried at the next flush
+            WORD_USAGE[language][word] += count
+        raise
+    changed_letters = defaultdict(set)
+    for word, language, _ in records:
+        changed_letters[language].add(word[0])
+    return changed_letters
+
+
+async def load_word_sampler(language: str = DEFAULT_LANGUAGE, letters: Optional[Set[str]] = None) -> None:
+    # Only the tables of the given starting letters are rebuilt if the language already has a sampler
+    previous = WORD_SAMPLERS.get(language) if letters else None
+    async with pool.acquire() as conn:
+        if previous:
+            res = await conn.fetch(
+                "SELECT word, count FROM wordusage WHERE language = $1 AND count > 0 AND left(word, 1) = ANY($2);",
+                language,
+                list(letters),
+            )
+        else:
+            res = await conn.fetch("SELECT word, count FROM wordusage WHERE language = $1 AND count > 0;", language)
+    if res:
+        # Built in a thread so that games keep running, the sampler is swapped in once complete
+        WORD_SAMPLERS[language] = await loop.run_in_executor(
+            None, WordSampler, {row["word"]: row["count"] for row in res}, ALPHABETS[language], previous
+        )
+
+
+async def update_word_usage_periodically() -> None:
+    # Counts of answers since the last flush are lost if the bot stops in between
+    while True:
+        await asyncio.sleep(WORD_USAGE_FLUSH_INTERVAL)
+        try:
+            # Counts flushed by other processes are picked up when a letter changes here too
+            changed_letters = await flush_word_usage()
+            for language, letters in changed_letters.items():
+                if language in DICTIONARIES:
+                    await load_word_sampler(language, letters)
+        except Exception:
+            logger.exception("Word usage update failed")
+
+
+async def refresh_words_periodically() -> None:
+    # Failed refreshes are retried at the next interval
+    delay = 0 if REFRESH_WORDS_ON_STARTUP else WORDS_REFRESH_INTERVAL
+    while True:
+        await asyncio.sleep(delay)
+        delay = WORDS_REFRESH_INTERVAL
+        for language in list(DICTIONARIES):
+            try:
+                async with words_locks[language]:
+                    await update_words(language)
+            except Exception:
+                logger.exception(f"Word list refresh failed ({language})")
 
 
 async def init() -> None:
-    global pool, session
+    global pool, session, wordlist_listener
     session = aiohttp.ClientSession(loop=loop)
     logger.info("Connecting to database")
     pool = await asyncpg.create_pool(DB_URI)
-    await update_words()
+    if WORDS_ROLE == "worker":
+        # Snapshots are memory-mapped read-only, so all processes share one physical copy of each index
+        while not await load_words_snapshot():
+            logger.info("Waiting for the builder process to publish a word snapshot")
+            await asyncio.sleep(WORDS_WATCH_INTERVAL)
+        loop.create_task(watch_words_snapshot())
+    else:
+        if not await load_words_snapshot():
+            await update_words(force=True)
+        loop.create_task(refresh_words_periodically())
+    await load_word_sampler()
+    loop.create_task(update_word_usage_periodically())
+    wordlist_listener = await asyncpg.connect(DB_URI)
+    await wordlist_listener.add_listener(
+        WORDLIST_CHANNEL, lambda conn, pid, channel, payload: loop.create_task(sync_wordlist(payload))
+    )
+    await wordlist_listener.add_listener(
+        GROUP_WORDLIST_CHANNEL, lambda conn, pid, channel, payload: loop.create_task(sync_overlay(payload))
+    )
 
 
 loop.run_until_complete(init())
@@ -110,6 +499,7 @@ class GameSettings:
     INITIAL_JOINING_PHASE_SECONDS = 60
     SPECIAL_GAME_INITIAL_JOINING_PHASE_SECONDS = 90
     MAX_JOINING_PHASE_SECONDS = 180
+    JOINING_PHASE_REMINDER_SECONDS = (60, 30, 15)
     NORMAL_GAME_MIN_PLAYERS = 2
     SPECIAL_GAME_MIN_PLAYERS = 5
     MAX_PLAYERS = 50
@@ -124,6 +514,8 @@ class GameSettings:
     WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE = 1
     TURNS_BETWEEN_LIMITS_CHANGE = 5
     ELIM_MAX_TURN_SCORE = 20
+    MIN_VALID_ANSWERS = 100  # Per starting letter, for randomly chosen game constraints
+    MAX_CONSTRAINT_DRAWS = 10
 
 
 class GroupFilter(BoundFilter):
@@ -0,0 +1,114 @@
+import argparse
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from words import ALPHABETS, Alphabet, load_sections, save_sections
+
+# Definitions files are sections files like word snapshots, see words.save_sections.
+# Words are in the word order of words.WordIndex, in zlib-compressed blocks of DEFINITIONS_PER_BLOCK
+# "word\tdefinition" entries separated by null bytes, with words encoded by the alphabet of the language.
+# The sections are an offset index of the blocks, the first word of each block and the blocks.
+DEFINITIONS_MAGIC = b"NWDEFS"
+DEFINITIONS_VERSION = 1
+DEFINITIONS_PER_BLOCK = 64
+
+
+def get_order_key(word: bytes) -> Tuple[bytes, int, bytes]:
+    # Sort key of an encoded word, same order as WordIndex ordinals
+    return word[:1], len(word), word
+
+
+def build_definitions(source_path: str, path: str, language: str) -> int:
+    # Builds a definitions file from a file with a word, a tab and a definition per line,
+    # a word may have several lines, returns the number of words with definitions
+    alphabet = ALPHABETS[language]
+    definitions: Dict[bytes, List[str]] = {}
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            word, _, definition = line.partition("\t")
+            word = alphabet.normalize(word.strip())
+            definition = " ".join(definition.replace("\0", "").split())
+            if alphabet.is_word(word) and definition:
+                definitions.setdefault(alphabet.encode(word), []).append(definition)
+    words = sorted(definitions, key=get_order_key)
+
+    blocks = []
+    block_offsets = [0]
+    key_offsets = [0]
+    for i in range(0, len(words), DEFINITIONS_PER_BLOCK):
+        entries = [w + b"\t" + "\n".join(definitions[w]).encode() for w in words[i:i + DEFINITIONS_PER_BLOCK]]
+        blocks.append(zlib.compress(b"\0".join(entries), 9))
+        block_offsets.append(block_offsets[-1] + len(blocks[-1]))
+        key_offsets.append(key_offsets[-1] + len(words[i]))
+    sections = {
+        "block_offsets": np.array(block_offsets, dtype=np.uint64),
+        "key_offsets": np.array(key_offsets, dtype=np.uint64),
+        "keys": np.frombuffer(b"".join(words[::DEFINITIONS_PER_BLOCK]), dtype=np.uint8),
+        "blocks": np.frombuffer(b"".join(blocks), dtype=np.uint8),
+    }
+    save_sections(
+        path, DEFINITIONS_MAGIC, DEFINITIONS_VERSION, sections, {"language": language, "word_count": len(words)}
+    )
+    return len(words)
+
+
+class Definitions:
+    # Read-only definitions file, memory-mapped so that only the pages of looked up blocks are ever read
+    # A lookup is a binary search over the first words of the blocks and the decompression of one block.
+
+    def __init__(self, path: str) -> None:
+        # Raises ValueError if the file is of another format version
+        # The checksum is not verified so that opening the file does not read all of it
+        self.mm, header, arrays, payload_start = load_sections(
+            path, DEFINITIONS_MAGIC, DEFINITIONS_VERSION, "definitions file", verify=False
+        )
+        self.alphabet: Alphabet = ALPHABETS[header["language"]]
+        self.word_count: int = header["word_count"]
+
+        self.block_offsets, self.key_offsets = arrays["block_offsets"], arrays["key_offsets"]
+        sections = header["sections"]
+        self.keys_start = payload_start + sections["keys"]["offset"]
+        self.blocks_start = payload_start + sections["blocks"]["offset"]
+        self.block_count = len(self.block_offsets) - 1
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def _get_first_word(self, block: int) -> bytes:
+        start = self.keys_start + int(self.key_offsets[block])
+        return self.mm[start:self.keys_start + int(self.key_offsets[block + 1])]
+
+    def get(self, word: str) -> Optional[str]:
+        # Definitions of a word separated by newlines, None if it has none
+        if not self.alphabet.is_word(word):
+            return None
+        key = self.alphabet.encode(word)
+        order_key = get_order_key(key)
+        # Last block whose first word is not after word
+        lo, hi = 0, self.block_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if get_order_key(self._get_first_word(mid)) <= order_key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        start = self.blocks_start + int(self.block_offsets[lo - 1])
+        block = zlib.decompress(self.mm[start:self.blocks_start + int(self.block_offsets[lo])])
+        for entry in block.split(b"\0"):
+            entry_word, _, definition = entry.partition(b"\t")
+            if entry_word == key:
+                return definition.decode()
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a definitions file from a file with word<TAB>definition lines")
+    parser.add_argument("source_path")
+    parser.add_argument("definitions_path")
+    parser.add_argument("--language", default="en", choices=ALPHABETS)
+    args = parser.parse_args()
+    print(build_definitions(args.source_path, args.definitions_path, args.language))
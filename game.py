@@ -1,16 +1,30 @@
 import asyncio
 import random
 from datetime import datetime
-from string import ascii_lowercase
-from typing import Any, Optional
+from typing import Any, Optional, Dict, Tuple, List
 
 from aiocache import cached
 from aiogram import types
 from aiogram.utils.exceptions import BadRequest
 from aiogram.utils.markdown import quote_html
 
-from constants import GAMES, STAR, GameSettings, GameState, bot, on9bot, pool, OWNER_ID
-from utils import get_random_word, send_admin_group, check_word_existence, has_star
+from constants import (
+    GAMES, STAR, GameSettings, GameState, bot, on9bot, pool, OWNER_ID, DEFAULT_LANGUAGE, WORD_USAGE, get_word_sampler,
+    get_words, get_overlay, timer_wheel
+)
+from utils import (
+    get_random_word,
+    send_admin_group,
+    check_word_existence,
+    has_star,
+    filter_words,
+    has_enough_answers,
+    get_suggestions,
+    WordPool,
+    UsedWords,
+)
+from timers import Timer
+from words import ALPHABETS, WordOverlay
 
 
 class Player:
@@ -52,9 +66,16 @@ class Player:
 
 class ClassicGame:
     name = "klasik oyun"
+    # Starting words and VP answers are drawn by how often players used them, see words.WORD_WEIGHTINGS
+    # None draws uniformly from all valid words.
+    starting_word_weighting: Optional[str] = "popular"
+    vp_answer_weighting: Optional[str] = "popular"
 
-    def __init__(self, group_id: int) -> None:
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
         self.group_id = group_id
+        # Word index of the language must be loaded before the game starts, see constants.ensure_words
+        self.language = language
+        self.alphabet = ALPHABETS[language]
         self.players = []
         self.players_in_game = []
         self.state = GameState.JOINING
@@ -63,6 +84,10 @@ class ClassicGame:
         # Store user ids rather than Player object since players may quit then join to extend again
         self.extended_user_ids = set()
 
+        # Deadline of the joining phase or the current turn in event loop time, see time_left and on_timer
+        self.deadline = 0.0
+        self.timer: Optional[Timer] = None  # Pending timer in the timer wheel, set once the game is started
+
         # Game settings
         self.min_players = GameSettings.NORMAL_GAME_MIN_PLAYERS
         self.max_players = GameSettings.MAX_PLAYERS
@@ -77,7 +102,47 @@ class ClassicGame:
         self.answered = False
         self.accepting_answers = False
         self.turns = 0
-        self.used_words = set()
+        self.used_words = UsedWords(language)
+        # Starting letter mapped to the VP answer pool of the current constraints,
+        # as (min letters limit, banned letters, required letter) and the pool
+        self.word_pools: Dict[str, Tuple[Tuple[int, Tuple[str, ...], Optional[str]], WordPool]] = {}
+        # Word list changes of the group, loaded when the game starts
+        self.overlay: Optional[WordOverlay] = None
+        self.theme: Optional[str] = None  # Tag of the word index all answers must have, see ThemedGame
+        # Reject answers with the lemma group of a used word, e.g. "cats" after "cat", see WordIndex.get_lemma
+        self.ban_inflections = False
+        self.hint: Optional[Tuple[Any, str]] = None  # Turn and constraints mapped to the hint text given for them
+
+    @property
+    def time_left(self) -> int:
+        # Seconds until the deadline, negative if it has passed and the timer wheel has not fired yet
+        return round(self.deadline - timer_wheel.now())
+
+    @time_left.setter
+    def time_left(self, seconds: int) -> None:
+        # Moves the deadline, e.g. 0 ends the turn or the joining phase as soon as the timer wheel fires
+        self.deadline = timer_wheel.now() + seconds
+        if self.timer:
+            self.schedule_timer()
+
+    def schedule_timer(self) -> None:
+        # Replace the pending timer with one for the next joining phase reminder or the deadline
+        if self.timer:
+            self.timer.cancel()
+        if self.state == GameState.KILLGAME:
+            return
+        when = self.deadline
+        if self.state == GameState.JOINING:
+            now = timer_wheel.now()
+            reminders = [
+                self.deadline - s for s in GameSettings.JOINING_PHASE_REMINDER_SECONDS if self.deadline - s > now
+            ]
+            when = min(reminders, default=when)
+        self.timer = timer_wheel.schedule(when, self.on_timer)
+
+    def end_turn(self) -> None:
+        # Move on to the next turn once the answer is processed
+        self.time_left = 0
 
     def user_in_game(self, user_id: int) -> bool:
         for p in self.players:
@@ -356,12 +421,135 @@ class ClassicGame:
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
-    def get_random_valid_answer(self) -> Optional[str]:
+    def get_word_pool(
+        self,
+        min_len: int,
+        starting_letter: str,
+        banned_letters: Optional[List[str]] = None,
+        required_letter: Optional[str] = None,
+    ) -> WordPool:
+        # Pools are built once per constraint state then shrink as words are used
+        # Only the pool of the latest constraints is kept per starting letter, so games changing constraints
+        # every turn rebuild it instead of keeping a pool for every combination they went through.
+        # VP answers are said by the bot, so pools leave out the words unsafe for it to say
+        key = (min_len, tuple(banned_letters or ()), required_letter)
+        entry = self.word_pools.get(starting_letter)
+        if entry is None or entry[0] != key:
+            entry = self.word_pools[starting_letter] = (
+                key,
+                WordPool(
+                    filter_words(
+                        min_len, starting_letter, banned_letters, required_letter,
+                        exclude_words=self.used_words, language=self.language, overlay=self.overlay, tag=self.theme,
+                        safe_only=True,
+                    )
+                ),
+            )
+        return entry[1]
+
+    def invalidate_word_pools(self) -> None:
+        # Drop pools built for a lower minimum letters limit
+        for letter, (key, _) in list(self.word_pools.items()):
+            if key[0] < self.min_letters_limit:
+                del self.word_pools[letter]
+
+    def remove_from_word_pools(self, word: str) -> None:
+        entry = self.word_pools.get(word[0])
+        if entry:
+            entry[1].remove(word)
+
+    def draw_answer(
+        self,
+        min_len: int,
+        starting_letter: str,
+        banned_letters: Optional[List[str]] = None,
+        required_letter: Optional[str] = None,
+    ) -> Optional[str]:
+        # Unused valid answer drawn by vp_answer_weighting, uniformly if no word used by players is valid
+        word_pool = self.get_word_pool(min_len, starting_letter, banned_letters, required_letter)
+        sampler = get_word_sampler(self.language)
+        if sampler and self.vp_answer_weighting:
+            for word in sampler.sample(
+                self.vp_answer_weighting, min_len, starting_letter, banned_letters, required_letter
+            ):
+                if word in word_pool and not self.is_inflection_of_used(word):
+                    return word
+        if not self.ban_inflections:
+            return word_pool.get_random_word()
+        for _ in range(10):  # Few pool words are inflections of used words
+            word = word_pool.get_random_word()
+            if not word or not self.is_inflection_of_used(word):
+                return word
+        words = [w for w in word_pool.words if not self.is_inflection_of_used(w)]
+        return random.choice(words) if words else None
+
+    def is_inflection_of_used(self, word: str) -> bool:
+        return self.ban_inflections and self.used_words.has_lemma_of(word)
+
+    def draw_starting_word(self, **constraints: Any) -> Optional[str]:
         return get_random_word(
-            min_len=self.min_letters_limit,
-            starting_letter=self.current_word[-1],
-            exclude_words=self.used_words,
+            **constraints,
+            language=self.language,
+            weighting=self.starting_word_weighting,
+            overlay=self.overlay,
+            tag=self.theme,
+            safe_only=True,
+        )
+
+    def get_answer_constraints(self) -> Tuple[int, str, Optional[List[str]], Optional[str]]:
+        # Minimum length, starting letter, banned letters and required letter of answers this turn
+        return self.min_letters_limit, self.current_word[-1], None, None
+
+    def get_random_valid_answer(self) -> Optional[str]:
+        return self.draw_answer(*self.get_answer_constraints())
+
+    def get_hint_text(self) -> str:
+        # Number of valid answers from the count tables of the word index minus the used words satisfying
+        # the constraints, and an unused answer with all letters but the first masked
+        # Cached until the turn or the constraints change, so repeated hints cost nothing.
+        min_len, starting_letter, banned_letters, required_letter = constraints = self.get_answer_constraints()
+        key = (self.turns, min_len, starting_letter, tuple(banned_letters or ()), required_letter)
+        if self.hint and self.hint[0] == key:
+            return self.hint[1]
+
+        index = get_words(self.language)
+        if self.theme:
+            # Counted over the tag bitset with used words excluded by their bitset, no word is decoded
+            # Words added by an overlay have no tags, so only its removed words change the count.
+            count = len(index.filter(*constraints, self.theme, self.used_words.get_bits()))
+            if self.overlay:
+                count -= sum(
+                    index.word_has_tag(self.theme, w) and w not in self.used_words
+                    for w in self.overlay.get_matching(self.overlay.removed, *constraints)
+                )
+        else:
+            banned = set(banned_letters or ())
+            used_count = sum(
+                len(w) >= min_len and w[0] == starting_letter and not banned & set(w)
+                and (not required_letter or required_letter in w)
+                for w in self.used_words
+            )
+            count = index.count(*constraints) - used_count
+            if self.overlay:
+                count += self.overlay.count_difference(index, *constraints)
+            count = max(count, 0)
+        text = f"Kalan geçerli kelime sayısı: {count}"
+        example = get_random_word(
+            *constraints, self.used_words, self.language, overlay=self.overlay, tag=self.theme
         )
+        if example:
+            text += f"\nÖrnek: `{example[0].upper()}{' _' * (len(example) - 1)}` ({len(example)} harf)"
+        self.hint = (key, text)
+        return text
+
+    async def give_hint(self, message: types.Message) -> None:
+        if self.state != GameState.RUNNING or not self.accepting_answers:
+            return
+        await message.reply(self.get_hint_text())
+
+    def get_final_min_letters_limit(self) -> int:
+        # Word length limit at the end of the game, constraints fixed for the whole game are checked against it
+        return max(self.min_letters_limit, GameSettings.MAX_WORD_LENGTH_LIMIT)
 
     async def vp_answer(self) -> None:
         # Wait before answering to prevent exceeding 20 msg/min message limit
@@ -379,6 +567,7 @@ class ClassicGame:
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        self.end_turn()
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         # To be overridden by other game modes
@@ -386,7 +575,7 @@ class ClassicGame:
         return True
 
     async def handle_answer(self, message: types.Message) -> None:
-        word = message.text.lower()
+        word = self.alphabet.normalize(message.text)
 
         # Check if answer is invalid
         if not word.startswith(self.current_word[-1]):
@@ -399,18 +588,34 @@ class ClassicGame:
         if word in self.used_words:
             await message.reply(f"_{word.capitalize()}_ kullanıldı.")
             return
-        if not check_word_existence(word):
-            await message.reply(f"_{word.capitalize()}_ benim kelime listemde değil.")
+        if self.is_inflection_of_used(word):
+            await message.reply(f"_{word.capitalize()}_ ile aynı kökten bir kelime kullanıldı.")
+            return
+        if not check_word_existence(word, self.language, self.overlay):
+            min_len, starting_letter, banned_letters, required_letter = self.get_answer_constraints()
+            await message.reply(
+                f"_{word.capitalize()}_ benim kelime listemde değil."
+                + get_suggestions(
+                    word, starting_letter, min_len, self.used_words, self.language, self.overlay,
+                    banned_letters, required_letter,
+                )
+            )
             return
         if not await self.additional_answer_checkers(word, message):
             return
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        self.end_turn()
 
     def post_turn_processing(self, word: str) -> None:
+        # Only answers of players count as usage, VP answers are drawn by usage
+        if not self.players_in_game[0].is_vp:
+            WORD_USAGE[self.language][word] += 1
+
         # Update attributes
         self.used_words.add(word)
+        self.remove_from_word_pools(word)
         self.turns += 1
 
         # self.current_word is constant for ChosenFirstLetterGame
@@ -431,6 +636,9 @@ class ClassicGame:
         # Set per-turn attributes
         self.answered = True
         self.accepting_answers = False
+        # The turn no longer expires, see end_turn
+        if self.timer:
+            self.timer.cancel()
 
     async def send_post_turn_message(self, word: str) -> None:
         text = f"_{word.capitalize()}_ kabul edilir.\n\n"
@@ -445,6 +653,7 @@ class ClassicGame:
                 )
             if self.min_letters_limit < GameSettings.MAX_WORD_LENGTH_LIMIT:
                 self.min_letters_limit += GameSettings.WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE
+                self.invalidate_word_pools()
                 text += (
                     f"Kelime başına asgari harf şu değerden artırıldı "
                     f"*{self.min_letters_limit - GameSettings.WORD_LENGTH_LIMIT_INCREASE_PER_LIMIT_CHANGE}* "
@@ -454,7 +663,7 @@ class ClassicGame:
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = self.draw_starting_word(min_len=self.min_letters_limit)
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -472,7 +681,6 @@ class ClassicGame:
             # Move player who just answered to the end of queue
             self.players_in_game.append(self.players_in_game.pop(0))
         else:
-            self.time_left -= 1
             if self.time_left > 0:
                 return False
 
@@ -581,11 +789,11 @@ class ClassicGame:
             )
 
     async def scan_for_stale_timer(self) -> None:
-        # Check if game timer is stuck
-        timer = self.time_left
+        # Check if game timer is stuck, i.e. the deadline passed and the timer wheel did not move it on
+        deadline = self.deadline
         for _ in range(5):
             await asyncio.sleep(1)
-            if timer != self.time_left and timer >= 0:
+            if deadline != self.deadline or self.time_left >= 0 or GAMES.get(self.group_id) is not self:
                 return  # Timer not stuck
 
         await send_admin_group(f"Uzatılmış bayat/negative amanlayıcı grubunda saptanan `{self.group_id}`. oyun sonlandırıldı.")
@@ -596,9 +804,32 @@ class ClassicGame:
 
         GAMES.pop(self.group_id, None)
 
-    async def main_loop(self, message: types.Message) -> None:
-        # Attempt to fix issue of stuck game with negative timer.
-        negative_timer = 0
+    async def kill(self) -> None:
+        # End the game right away, its pending timer would otherwise only notice when it fires
+        self.state = GameState.KILLGAME
+        if self.timer:
+            self.timer.cancel()
+        if GAMES.get(self.group_id) is self:
+            del GAMES[self.group_id]
+        try:
+            await self.send_message("Oyun zorla sona erdi.")
+        except:
+            pass
+
+    async def handle_error(self, e: Exception) -> None:
+        if self.timer:
+            self.timer.cancel()
+        GAMES.pop(self.group_id, None)
+        try:
+            await self.send_message(
+                f"Aşağıdaki hata nedeniyle oyun sona erdi:\n`{e.__class__.__name__}: {e}`.\n"
+                "Sahibim bilgilendirilecek."
+            )
+        except:
+            pass
+
+    async def start(self, message: types.Message) -> None:
+        # Announce the game and hand it over to the timer wheel, which calls on_timer whenever something is due
         try:
             await self.send_message(
                 f"A{'n' if self.name[0] in 'aeiou' else ''} {self.name} başlıyor.\n"
@@ -606,64 +837,72 @@ class ClassicGame:
                 f"{self.time_left}s to /join."
             )
             await self.join(message)
+            if GAMES.get(self.group_id) is self:
+                self.schedule_timer()
+        except Exception as e:
+            await self.handle_error(e)
+            raise
 
-            while True:
-                await asyncio.sleep(1)
-                if self.state == GameState.JOINING:
-                    if self.time_left > 0:
-                        self.time_left -= 1
-                        if self.time_left in (15, 30, 60):
-                            await self.send_message(f"{self.time_left} saniye kaldı katılmak için /join.")
-                    else:
-                        if len(self.players) < self.min_players:
-                            await self.send_message("Yeterli oyuncu yok. Oyun sonlandırıldı.")
-                            del GAMES[self.group_id]
-                            return
-                        else:
-                            self.state = GameState.RUNNING
-                            await self.send_message("Oyun başlıyor...")
-
-                            random.shuffle(self.players)
-                            self.players_in_game = self.players[:]
-
-                            await self.running_initialization()
-                            await self.send_turn_message()
-                elif self.state == GameState.RUNNING:
-                    # Check for prolonged negative timer
-                    if self.time_left < 0:
-                        negative_timer += 1
-                    if negative_timer >= 5:
-                        raise ValueError("negatif zamanlayıcı uzun süre.")
-
-                    if await self.running_phase_tick():  # True: Game ended
-                        await self.update_db()
-                        return
-                elif self.state == GameState.KILLGAME:
-                    await self.send_message("Oyun zorla sona erdi.")
+    async def on_timer(self) -> None:
+        # Joining phase reminder, end of the joining phase, end of a turn or turn expiry
+        if GAMES.get(self.group_id) is not self:  # Killed or ended
+            return
+        try:
+            if self.state == GameState.JOINING:
+                if self.time_left > 0:
+                    await self.send_message(f"{self.time_left} saniye kaldı katılmak için /join.")
+                    self.schedule_timer()
+                elif len(self.players) < self.min_players:
+                    await self.send_message("Yeterli oyuncu yok. Oyun sonlandırıldı.")
                     del GAMES[self.group_id]
-                    return
+                else:
+                    self.state = GameState.RUNNING
+                    await self.send_message("Oyun başlıyor...")
+                    self.overlay = await get_overlay(self.group_id, self.language)
+
+                    random.shuffle(self.players)
+                    self.players_in_game = self.players[:]
+
+                    await self.running_initialization()
+                    await self.send_turn_message()
+            elif self.state == GameState.RUNNING:
+                if await self.running_phase_tick():  # True: Game ended
+                    await self.update_db()
         except Exception as e:
-            GAMES.pop(self.group_id, None)
-            try:
-                await self.send_message(
-                    f"Aşağıdaki hata nedeniyle oyun sona erdi:\n`{e.__class__.__name__}: {e}`.\n"
-                    "Sahibim bilgilendirilecek."
-                )
-            except:
-                pass
+            await self.handle_error(e)
+            await send_admin_group(
+                f"Oyun `{self.group_id}` aşağıdaki hata nedeniyle sona erdi:\n`{e.__class__.__name__}: {e}`"
+            )
             raise
 
 
 class HardModeGame(ClassicGame):
     name = "zor mod oyunu"
+    starting_word_weighting = "rare"
 
-    def __init__(self, group_id: int) -> None:
-        super().__init__(group_id)
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+        super().__init__(group_id, language)
         # Hardest settings available
         self.time_limit = GameSettings.MIN_TURN_SECONDS
         self.min_letters_limit = GameSettings.MAX_WORD_LENGTH_LIMIT
 
 
+class ThemedGame(ClassicGame):
+    name = "tema oyunu"
+
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE, theme: str = "") -> None:
+        super().__init__(group_id, language)
+        # Theme must already be loaded into the word index, see constants.load_theme
+        self.theme = theme
+        self.name = f"{theme} {self.name}"
+
+    async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
+        if not get_words(self.language).word_has_tag(self.theme, word):
+            await message.reply(f"_{word.capitalize()}_ {self.theme} temasına uymuyor.")
+            return False
+        return True
+
+
 class ChaosGame(ClassicGame):
     name = "kaos oyunu"
 
@@ -690,7 +929,7 @@ class ChaosGame(ClassicGame):
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = self.draw_starting_word(min_len=self.min_letters_limit)
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -706,7 +945,6 @@ class ChaosGame(ClassicGame):
             player = self.players_in_game.pop(random.randint(0, len(self.players_in_game) - 2))
             self.players_in_game.insert(0, player)
         else:
-            self.time_left -= 1
             if self.time_left > 0:
                 return
 
@@ -758,7 +996,7 @@ class ChosenFirstLetterGame(ClassicGame):
     async def running_initialization(self) -> None:
         # Instead of storing the last used word like in other game modes,
         # self.current_word stores in the chosen first letter which is constant throughout the game
-        self.current_word = random.choice(ascii_lowercase)
+        self.current_word = self.choose_first_letter()
         self.start_time = datetime.now().replace(microsecond=0)
 
         await self.send_message(
@@ -767,12 +1005,18 @@ class ChosenFirstLetterGame(ClassicGame):
             parse_mode=types.ParseMode.HTML,
         )
 
+    def choose_first_letter(self) -> str:
+        # Uniformly among the letters with enough answers until the end of the game
+        min_len = self.get_final_min_letters_limit()
+        letters = self.alphabet.letters
+        return random.choice([c for c in letters if has_enough_answers(min_len, c, language=self.language)] or letters)
+
 
 class BannedLettersGame(ClassicGame):
     name = "yasaklanmış mektup oyunu"
 
-    def __init__(self, group_id: int) -> None:
-        super().__init__(group_id)
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+        super().__init__(group_id, language)
         self.banned_letters = []
 
     async def send_turn_message(self) -> None:
@@ -798,13 +1042,8 @@ class BannedLettersGame(ClassicGame):
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
-    def get_random_valid_answer(self) -> Optional[str]:
-        return get_random_word(
-            min_len=self.min_letters_limit,
-            starting_letter=self.current_word[-1],
-            banned_letters=self.banned_letters,
-            exclude_words=self.used_words,
-        )
+    def get_answer_constraints(self) -> Tuple[int, str, Optional[List[str]], Optional[str]]:
+        return self.min_letters_limit, self.current_word[-1], self.banned_letters, None
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         used_banned_letters = sorted(set(word) & set(self.banned_letters))
@@ -817,26 +1056,39 @@ class BannedLettersGame(ClassicGame):
         return True
 
     def set_banned_letters(self) -> None:
-        self.banned_letters.clear()  # Mode may occur multiple times in mixed elimination
+        # Redraw banned letters which leave too few answers for a starting letter that has enough otherwise,
+        # keeping the draw leaving the fewest such starting letters if none is fair
+        min_len = self.get_final_min_letters_limit()
+        vowels = self.alphabet.vowels
+        starting_letters = [c for c in self.alphabet.letters if has_enough_answers(min_len, c, language=self.language)]
+        best_draw = None
+        for _ in range(GameSettings.MAX_CONSTRAINT_DRAWS):
+            # Set banned letters (maximum one vowel)
+            banned_letters = []
+            alphabets = list(self.alphabet.letters)
+            for _ in range(random.randint(2, 4)):
+                banned_letters.append(random.choice(alphabets))
+                if banned_letters[-1] in vowels:
+                    alphabets = [c for c in alphabets if c not in vowels]
+                else:
+                    alphabets.remove(banned_letters[-1])
+            dead_letters = sum(
+                c not in banned_letters and not has_enough_answers(min_len, c, banned_letters, language=self.language)
+                for c in starting_letters
+            )
+            if best_draw is None or dead_letters < best_draw[0]:
+                best_draw = (dead_letters, banned_letters)
+            if not dead_letters:
+                break
 
-        # Set banned letters (maximum one vowel)
-        alphabets = list(ascii_lowercase)
-        for _ in range(random.randint(2, 4)):
-            self.banned_letters.append(random.choice(alphabets))
-            if self.banned_letters[-1] in "aeiou":
-                alphabets = [c for c in alphabets if c not in "aeiou"]
-            else:
-                alphabets.remove(self.banned_letters[-1])
-        self.banned_letters.sort()
+        self.banned_letters.clear()  # Mode may occur multiple times in mixed elimination
+        self.banned_letters.extend(sorted(best_draw[1]))
 
     async def running_initialization(self) -> None:
         self.set_banned_letters()
 
         # Random starting word
-        self.current_word = get_random_word(
-            min_len=self.min_letters_limit,
-            banned_letters=self.banned_letters,
-        )
+        self.current_word = self.draw_starting_word(min_len=self.min_letters_limit, banned_letters=self.banned_letters)
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -851,8 +1103,8 @@ class BannedLettersGame(ClassicGame):
 class RequiredLetterGame(ClassicGame):
     name = "gerekli harf oyunu"
 
-    def __init__(self, group_id: int) -> None:
-        super().__init__(group_id)
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+        super().__init__(group_id, language)
         # Answer must contain required letter.
         # Required letter cannot be the ending letter of self.current_word so as to annoy the player.
         self.required_letter = None  # Changes every turn
@@ -879,13 +1131,8 @@ class RequiredLetterGame(ClassicGame):
         if self.players_in_game[0].is_vp:
             await self.vp_answer()
 
-    def get_random_valid_answer(self) -> Optional[str]:
-        return get_random_word(
-            min_len=self.min_letters_limit,
-            starting_letter=self.current_word[-1],
-            required_letter=self.required_letter,
-            exclude_words=self.used_words,
-        )
+    def get_answer_constraints(self) -> Tuple[int, str, Optional[List[str]], Optional[str]]:
+        return self.min_letters_limit, self.current_word[-1], None, self.required_letter
 
     async def additional_answer_checkers(self, word: str, message: types.Message) -> bool:
         if self.required_letter not in word:
@@ -894,9 +1141,19 @@ class RequiredLetterGame(ClassicGame):
         return True
 
     def change_required_letter(self) -> None:
-        letters = list(ascii_lowercase)
+        letters = list(self.alphabet.letters)
         letters.remove(self.current_word[-1])
-        self.required_letter = random.choice(letters)
+        # Skip letters leaving too few answers for this turn
+        starting_letter = self.current_word[-1]
+        self.required_letter = random.choice(
+            [
+                c for c in letters
+                if has_enough_answers(
+                    self.min_letters_limit, starting_letter, required_letters=c, language=self.language
+                )
+            ]
+            or letters
+        )
 
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
@@ -904,7 +1161,7 @@ class RequiredLetterGame(ClassicGame):
 
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word(min_len=self.min_letters_limit)
+        self.current_word = self.draw_starting_word(min_len=self.min_letters_limit)
         self.used_words.add(self.current_word)
         self.change_required_letter()
         self.start_time = datetime.now().replace(microsecond=0)
@@ -919,8 +1176,8 @@ class RequiredLetterGame(ClassicGame):
 class EliminationGame(ClassicGame):
     name = "eleme oyunu"
 
-    def __init__(self, group_id: int) -> None:
-        super().__init__(group_id)
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+        super().__init__(group_id, language)
 
         # Elimination game settings
         self.min_players = GameSettings.SPECIAL_GAME_MIN_PLAYERS
@@ -1019,9 +1276,12 @@ class EliminationGame(ClassicGame):
         await self.send_message(text)
         # No limit reduction
 
+    def get_final_min_letters_limit(self) -> int:
+        return self.min_letters_limit
+
     async def running_initialization(self) -> None:
         # Random starting word
-        self.current_word = get_random_word()
+        self.current_word = self.draw_starting_word()
         self.used_words.add(self.current_word)
         self.start_time = datetime.now().replace(microsecond=0)
 
@@ -1036,7 +1296,6 @@ class EliminationGame(ClassicGame):
 
     async def running_phase_tick(self) -> bool:
         if not self.answered:
-            self.time_left -= 1
             if self.time_left > 0:
                 return False
             self.accepting_answers = False
@@ -1111,12 +1370,20 @@ class MixedEliminationGame(EliminationGame):
         RequiredLetterGame,
     ]
 
-    def __init__(self, group_id):
-        super().__init__(group_id)
+    def __init__(self, group_id: int, language: str = DEFAULT_LANGUAGE) -> None:
+        super().__init__(group_id, language)
         self.game_mode = None
         self.banned_letters = []
         self.required_letter = None
 
+    def get_answer_constraints(self) -> Tuple[int, str, Optional[List[str]], Optional[str]]:
+        return (
+            self.min_letters_limit,
+            self.current_word[0 if self.game_mode is ChosenFirstLetterGame else -1],
+            self.banned_letters if self.game_mode is BannedLettersGame else None,
+            self.required_letter if self.game_mode is RequiredLetterGame else None,
+        )
+
     async def send_turn_message(self) -> None:
         text = f"Çevirin: {self.players_in_game[0].mention}"
         if self.turns_until_elimination > 1:
@@ -1152,7 +1419,7 @@ class MixedEliminationGame(EliminationGame):
         return True
 
     async def handle_answer(self, message: types.Message) -> None:
-        word = message.text.lower()
+        word = self.alphabet.normalize(message.text)
 
         # Starting letter
         if self.game_mode is ChosenFirstLetterGame:
@@ -1166,14 +1433,26 @@ class MixedEliminationGame(EliminationGame):
         if word in self.used_words:
             await message.reply(f"_{word.capitalize()}_ kullanıldı.")
             return
-        if not check_word_existence(word):
-            await message.reply(f"_{word.capitalize()}_ benim kelime listemde değil.")
+        if self.is_inflection_of_used(word):
+            await message.reply(f"_{word.capitalize()}_ ile aynı kökten bir kelime kullanıldı.")
+            return
+        if not check_word_existence(word, self.language, self.overlay):
+            # No minimum letters limit in elimination games
+            _, starting_letter, banned_letters, required_letter = self.get_answer_constraints()
+            await message.reply(
+                f"_{word.capitalize()}_ benim kelime listemde değil."
+                + get_suggestions(
+                    word, starting_letter, exclude_words=self.used_words, language=self.language, overlay=self.overlay,
+                    banned_letters=banned_letters, required_letter=required_letter,
+                )
+            )
             return
         if not await self.additional_answer_checkers(word, message):
             return
 
         self.post_turn_processing(word)
         await self.send_post_turn_message(word)
+        self.end_turn()
 
     def post_turn_processing(self, word: str) -> None:
         super().post_turn_processing(word)
@@ -1190,12 +1469,12 @@ class MixedEliminationGame(EliminationGame):
         # Set starting word and mode-based attributes
         if self.game_mode is BannedLettersGame:
             BannedLettersGame.set_banned_letters(self)
-            self.current_word = get_random_word(banned_letters=self.banned_letters)
+            self.current_word = self.draw_starting_word(banned_letters=self.banned_letters)
         elif self.game_mode is ChosenFirstLetterGame:
             # Ensure uniform probability of each letter as the starting letter
-            self.current_word = get_random_word(starting_letter=random.choice(ascii_lowercase))
+            self.current_word = self.draw_starting_word(starting_letter=ChosenFirstLetterGame.choose_first_letter(self))
         else:
-            self.current_word = get_random_word()
+            self.current_word = self.draw_starting_word()
         if self.game_mode is RequiredLetterGame:
             RequiredLetterGame.change_required_letter(self)
         self.used_words.add(self.current_word)
@@ -44,5 +44,21 @@ CREATE TABLE donation (
 CREATE TABLE wordlist (
     word TEXT NOT NULL,
     accepted BOOLEAN NOT NULL,
-    reason TEXT
+    reason TEXT,
+    language TEXT NOT NULL DEFAULT 'en'
+);
+
+CREATE TABLE wordusage (
+    word TEXT NOT NULL,
+    language TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (word, language)
+);
+
+CREATE TABLE groupwordlist (
+    group_id BIGINT NOT NULL,
+    language TEXT NOT NULL,
+    word TEXT NOT NULL,
+    accepted BOOLEAN NOT NULL,
+    PRIMARY KEY (group_id, language, word)
 );
@@ -1,11 +1,12 @@
 import asyncio
 import os
+import tempfile
 from datetime import datetime, timedelta
 from decimal import Decimal, getcontext, ROUND_HALF_UP, InvalidOperation
+from functools import lru_cache
 from random import seed
-from string import ascii_lowercase
 from time import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import uuid4
 
 import aiofiles
@@ -18,13 +19,17 @@ from aiogram.utils.markdown import quote_html
 
 from constants import (
     bot, on9bot, dp, VIP, VIP_GROUP, ADMIN_GROUP_ID, OFFICIAL_GROUP_ID, WORD_ADDITION_CHANNEL_ID,
-    GAMES, pool, PROVIDER_TOKEN, GameState, GameSettings, update_words, ADD_TO_GROUP_KEYBOARD
+    GAMES, pool, PROVIDER_TOKEN, GameState, GameSettings, get_words, ADD_TO_GROUP_KEYBOARD, OWNER_ID,
+    INLINE_RESULTS_PER_PAGE, INLINE_CACHE_TIME, INLINE_PAGE_CACHE_SIZE, REJECTED_WORDS, PENDING_WORDS,
+    notify_wordlist_changed, DEFAULT_LANGUAGE, WORD_LIST_URLS, DICTIONARIES, ensure_words, WORD_IMPORT_BATCH_SIZE,
+    WORDS_ROLE, rebuild_words, get_overlay, notify_group_wordlist_changed, get_themes, load_theme, get_definitions,
+    DEFINITION_MAX_LENGTH, add_words
 )
 from game import (
     ClassicGame, HardModeGame, ChaosGame, ChosenFirstLetterGame, BannedLettersGame,
-    RequiredLetterGame, EliminationGame, MixedEliminationGame
+    RequiredLetterGame, EliminationGame, MixedEliminationGame, ThemedGame
 )
-from utils import send_admin_group, amt_donated, check_word_existence, has_star, filter_words
+from utils import send_admin_group, amt_donated, check_word_existence, has_star, get_suggestions, resolve_words
 
 seed(time())
 getcontext().rounding = ROUND_HALF_UP
@@ -97,7 +102,10 @@ async def cmd_help(message: types.Message) -> None:
         (
             "/gameinfo - Oyun modu açıklamaları\n"
             "/troubleshoot - Sık karşılaşılan sorunları nasıl çözeceğinizi öğrenin\n"
-            "/reqaddword - Kelimelerin eklenmesini iste\n\n"
+            "/hint - Oyunda bu tur için kalan geçerli kelime sayısını gösterin\n"
+            "/reqaddword - Kelimelerin eklenmesini iste\n"
+            "/search - Kalıba uyan kelimeleri ara (bağış ödülü)\n"
+            "/define - Bir kelimenin tanımını göster\n\n"
             "Botla ilgili herhangi bir şey için [POYRAZ](tg://user?id=1557151130) in *Kürtçe veya Türkçe* mesaj gönderebilirsiniz.\n"
             "Resmi Grup: @Fmsarkilar\n"
             "Kelime Ekleme Kanalı (durum güncellemeli): @NightWordGame\n"
@@ -120,12 +128,15 @@ async def cmd_gameinfo(message: types.Message) -> None:
         "/startchaos - Kaos oyunu (rastgele sıra sırası)\n"
         "/startcfl - İlk harf oyunu seçildi\n"
         "/startbl - Yasaklı harfler oyunu\n"
-        "/startrl - Gerekli harf oyunu\n\n"
+        "/startrl - Gerekli harf oyunu\n"
+        "/starttheme - Tema oyunu (yalnızca temaya uyan kelimeler)\n"
+        "/banforms - Katılım sırasında: kullanılan kelimelerle aynı kökten kelimeleri yasakla\n\n"
         "/startelim - Eleme oyunu\n"
         "Her oyuncunun puanı kümülatif kelime uzunluğudur. "
         "En düşük puana sahip oyuncular her turdan sonra elenir.\n\n"
         "/startmelim - Karışık eleme oyunu (bağış ödülü)\n"
-        "Farklı modlara sahip eleme oyunu. @Fmsarkilar."
+        "Farklı modlara sahip eleme oyunu. @Fmsarkilar.\n\n"
+        f"Oyunlar başka bir dilde başlatılabilir, örneğin `/startclassic tr`. Diller: {', '.join(WORD_LIST_URLS)}"
     )
 
 
@@ -215,11 +226,12 @@ async def cmd_playinggroups(message: types.Message) -> None:
 
 @dp.message_handler(commands=["exist", "exists"])
 async def cmd_exists(message: types.Message) -> None:
-    word = message.text.partition(" ")[2].lower()
-    if not word or not all(c in ascii_lowercase for c in word):  # No proper argument given
+    alphabet = get_words().alphabet
+    word = alphabet.normalize(message.text.partition(" ")[2])
+    if not alphabet.is_word(word):  # No proper argument given
         rmsg = message.reply_to_message
-        if rmsg and rmsg.text and all(c in ascii_lowercase for c in rmsg.text.lower()):
-            word = rmsg.text.lower()
+        if rmsg and rmsg.text and alphabet.is_word(alphabet.normalize(rmsg.text)):
+            word = alphabet.normalize(rmsg.text)
         else:
             await message.reply(
                 "İşlev: Sözlüğümde bir sözcük olup olmadığını kontrol edin. "
@@ -230,7 +242,103 @@ async def cmd_exists(message: types.Message) -> None:
     if check_word_existence(word):
         await message.reply(f"_{word.capitalize()}_ is *sözlüğümde*.")
     else:
-        await message.reply(f"_{word.capitalize()}_ is *sözlüğümde* Değil.")
+        await message.reply(f"_{word.capitalize()}_ is *sözlüğümde* Değil." + get_suggestions(word))
+
+
+@dp.message_handler(commands="define")
+async def cmd_define(message: types.Message) -> None:
+    # Read from a local file opened on first use, see definitions.py
+    word, _, language = message.get_args().strip().partition(" ")
+    language = language.strip().lower() or DEFAULT_LANGUAGE
+    definitions = get_definitions(language) if language in WORD_LIST_URLS else None
+    if not definitions:
+        await message.reply(f"Bu dil için tanım yok: {quote_html(language)}", parse_mode=types.ParseMode.HTML)
+        return
+    alphabet = definitions.alphabet
+    word = alphabet.normalize(word)
+    if not alphabet.is_word(word):  # No proper argument given
+        rmsg = message.reply_to_message
+        if rmsg and rmsg.text and alphabet.is_word(alphabet.normalize(rmsg.text)):
+            word = alphabet.normalize(rmsg.text)
+        else:
+            await message.reply(
+                "İşlev: Sözlüğümdeki bir kelimenin tanımını göster.\n"
+                "Kullanım: `/define kelime` veya `/define kelime dil`"
+            )
+            return
+    definition = definitions.get(word)
+    if definition is None:
+        await message.reply(f"_{word.capitalize()}_ için tanım bulunamadı.")
+        return
+    if len(definition) > DEFINITION_MAX_LENGTH:
+        definition = definition[:DEFINITION_MAX_LENGTH].rpartition("\n")[0] or definition[:DEFINITION_MAX_LENGTH]
+    await message.reply(
+        f"<b>{quote_html(word.capitalize())}</b>\n{quote_html(definition)}", parse_mode=types.ParseMode.HTML
+    )
+
+
+@dp.message_handler(commands="search")
+async def cmd_search(message: types.Message) -> None:
+    if message.from_user.id != OWNER_ID and not await has_star(message.from_user.id):
+        await message.reply("Bu komut bir bağış ödülüdür.")
+        return
+    alphabet = get_words().alphabet
+    pattern = "*"
+    min_len, max_len = 1, None
+    required_letters = banned_letters = ""
+    for arg in alphabet.normalize(message.get_args()).split():
+        if arg[0] == "+" and alphabet.is_word(arg[1:]):  # Letters to include
+            required_letters += arg[1:]
+        elif arg[0] == "-" and alphabet.is_word(arg[1:]):  # Letters to exclude
+            banned_letters += arg[1:]
+        elif arg[-1] == "+" and arg[:-1].isdigit():  # Minimum length
+            min_len = int(arg[:-1])
+        elif arg.count("-") == 1 and all(x.isdigit() for x in arg.split("-")):  # Length range
+            min_len, max_len = map(int, arg.split("-"))
+        elif all(c in alphabet.indexes or c in "?*" for c in arg):
+            pattern = arg
+        else:
+            pattern = ""
+            break
+    if not pattern or pattern == "*" and not (required_letters or banned_letters or min_len > 1 or max_len):
+        await message.reply(
+            "İşlev: Kalıba ve harf koşullarına uyan kelimeleri arayın.\n"
+            "`?` herhangi bir harf, `*` herhangi sayıda harf, `+q` q içerir, `-u` u içermez, "
+            "`8+` en az 8 harf, `5-7` 5 ile 7 arası harf.\n"
+            "Kullanım: `/search a??le*` veya `/search +q -u 8+`"
+        )
+        return
+
+    words = get_words()
+    ordinals = words.search(pattern, min_len, max_len, banned_letters, required_letters)
+    if not len(ordinals):
+        await message.reply("Sonuç bulunamadı.")
+        return
+    shown = words.get_words_at(ordinals[:100])  # Max 100 results
+    await message.reply(
+        f"{len(ordinals)} kelime bulundu"
+        + (f", ilk {len(shown)} tanesi" if len(shown) < len(ordinals) else "")
+        + ":\n" + ", ".join(w.capitalize() for w in shown)
+    )
+
+
+async def get_game_language(message: types.Message, arg: Optional[str] = None) -> Optional[str]:
+    # Language of a new game given as the argument of a start command, its word index is loaded on first use
+    # Returns None if no game should be started.
+    language = (message.get_args() if arg is None else arg).strip().lower() or DEFAULT_LANGUAGE
+    if language not in WORD_LIST_URLS:
+        await message.reply(
+            f"Desteklenen diller: {', '.join(WORD_LIST_URLS)}\n"
+            f"Kullanım: `/{message.get_command(pure=True)} {DEFAULT_LANGUAGE}`"
+        )
+        return None
+    if language not in DICTIONARIES:
+        await message.reply("Bu dilin kelime listesi hazırlanıyor, lütfen bekleyin.")
+        await ensure_words(language)
+        if message.chat.id in GAMES:  # Started while the word list was being prepared
+            await GAMES[message.chat.id].join(message)
+            return None
+    return language
 
 
 @dp.message_handler(commands=["startclassic", "startgame"])
@@ -245,9 +353,12 @@ async def cmd_startclassic(message: types.Message) -> None:
     if MAINT_MODE:  # Only stop people from starting games, not joining
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
-    game = ClassicGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = ClassicGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="starthard")
@@ -264,9 +375,12 @@ async def cmd_starthard(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = HardModeGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = HardModeGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startchaos")
@@ -283,9 +397,12 @@ async def cmd_startchaos(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = ChaosGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = ChaosGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startcfl")
@@ -302,9 +419,12 @@ async def cmd_startcfl(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = ChosenFirstLetterGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = ChosenFirstLetterGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startbl")
@@ -321,9 +441,12 @@ async def cmd_startbl(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = BannedLettersGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = BannedLettersGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startrl")
@@ -340,9 +463,45 @@ async def cmd_startrl(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = RequiredLetterGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = RequiredLetterGame(message.chat.id, language)
+    GAMES[group_id] = game
+    await game.start(message)
+
+
+@dp.message_handler(commands="starttheme")
+async def cmd_starttheme(message: types.Message) -> None:
+    if message.chat.id > 0:
+        await groups_only_command(message)
+        return
+
+    group_id = message.chat.id
+    if group_id in GAMES:
+        await GAMES[group_id].join(message)
+        return
+    if MAINT_MODE:
+        await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
+        return
+
+    theme, _, language_arg = message.get_args().strip().lower().partition(" ")
+    language = await get_game_language(message, language_arg)
+    if not language:
+        return
+    themes = get_themes(language)
+    if theme not in themes:
+        await message.reply(
+            f"Temalar: {', '.join(themes) if themes else 'yok'}\n"
+            "Kullanım: `/starttheme tema` veya `/starttheme tema dil`"
+        )
+        return
+    words = get_words(language)
+    if theme not in words.tags:
+        load_theme(words, theme)
+    game = ThemedGame(message.chat.id, language, theme)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startelim")
@@ -359,9 +518,12 @@ async def cmd_startelim(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = EliminationGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = EliminationGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="startmelim")
@@ -389,9 +551,12 @@ async def cmd_startmixedelim(message: types.Message) -> None:
         await message.reply("Bakım modu açık. Oyunlar geçici olarak devre dışı bırakıldı.")
         return
 
-    game = MixedEliminationGame(message.chat.id)
+    language = await get_game_language(message)
+    if not language:
+        return
+    game = MixedEliminationGame(message.chat.id, language)
     GAMES[group_id] = game
-    await game.main_loop(message)
+    await game.start(message)
 
 
 @dp.message_handler(commands="join")
@@ -445,6 +610,13 @@ async def cmd_flee(message: types.Message) -> None:
         await GAMES[group_id].flee(message)
 
 
+@dp.message_handler(is_group=True, commands="hint")
+async def cmd_hint(message: types.Message) -> None:
+    group_id = message.chat.id
+    if group_id in GAMES:
+        await GAMES[group_id].give_hint(message)
+
+
 @dp.message_handler(is_group=True, is_owner=True, commands="forceflee")
 async def cmd_forceflee(message: types.Message) -> None:
     group_id = message.chat.id
@@ -456,10 +628,8 @@ async def cmd_forceflee(message: types.Message) -> None:
 async def cmd_killgame(message: types.Message) -> None:
     group_id = int(message.get_args() or message.chat.id)
     if group_id in GAMES:
-        GAMES[group_id].state = GameState.KILLGAME
-        await asyncio.sleep(2)
-        if group_id in GAMES:
-            del GAMES[group_id]
+        await GAMES[group_id].kill()
+        if group_id != message.chat.id:
             await message.reply("Oyun zorla sona erdi.")
 
 
@@ -509,6 +679,19 @@ async def cmd_incmaxp(message: types.Message) -> None:
     )
 
 
+@dp.message_handler(is_group=True, is_admin=True, commands="banforms")
+async def cmd_banforms(message: types.Message) -> None:
+    group_id = message.chat.id
+    if group_id not in GAMES or GAMES[group_id].state != GameState.JOINING:
+        return
+    game = GAMES[group_id]
+    game.ban_inflections = not game.ban_inflections
+    if game.ban_inflections:
+        await message.reply("Bu oyunda kullanılan kelimelerle aynı kökten kelimeler (ör. cat, cats) kabul edilmeyecek.")
+    else:
+        await message.reply("Bu oyunda aynı kökten kelimeler tekrar kabul edilecek.")
+
+
 @dp.message_handler(is_owner=True, commands="maintmode")
 async def cmd_maintmode(message: types.Message) -> None:
     global MAINT_MODE
@@ -756,7 +939,8 @@ async def cmd_reqaddword(message: types.Message) -> None:
     if message.forward_from:
         return
 
-    words_to_add = [w for w in set(message.get_args().lower().split()) if all(c in ascii_lowercase for c in w)]
+    alphabet = get_words().alphabet
+    words_to_add = [w for w in set(alphabet.normalize(message.get_args()).split()) if alphabet.is_word(w)]
     if not words_to_add:
         await message.reply(
             "İşlev: Yeni sözcüklerin eklenmesini talep edin. Yeni sözcükler için @Poyraz2103.\n"
@@ -766,28 +950,10 @@ async def cmd_reqaddword(message: types.Message) -> None:
         )
         return
 
-    existing = []
-    rejected = []
-    rejected_with_reason = []
-    for w in words_to_add[:]:  # Iterate through a copy so removal of elements is possible
-        if check_word_existence(w):
-            existing.append("_" + w.capitalize() + "_")
-            words_to_add.remove(w)
-
-    async with pool.acquire() as conn:
-        rej = await conn.fetch("SEÇİN kelime, kabul edilmeyen kelime listesinden neden;")
-    for word, reason in rej:
-        if word not in words_to_add:
-            continue
-        words_to_add.remove(word)
-        word = "_" + word.capitalize() + "_"
-        if reason:
-            rejected_with_reason.append((word, reason))
-        else:
-            rejected.append(word)
-
+    existing, rejected, pending, words_to_add = resolve_words(words_to_add)
     text = ""
     if words_to_add:
+        PENDING_WORDS[DEFAULT_LANGUAGE].update(words_to_add)
         text += f"Öneri {', '.join(['_' + w.capitalize() + '_' for w in words_to_add])} for approval.\n"
         await send_admin_group(
             message.from_user.get_mention(
@@ -799,53 +965,60 @@ async def cmd_reqaddword(message: types.Message) -> None:
             + " kelime listesine. #reqaddword",
             parse_mode=types.ParseMode.HTML,
         )
+    text += get_word_status_text(existing, rejected, pending)
+    await message.reply(text.rstrip())
+
+
+def get_word_status_text(
+    existing: List[str], rejected: List[Tuple[str, Optional[str]]], pending: Optional[List[str]] = None
+) -> str:
+    # Reply lines for words which cannot be requested or added, see resolve_words
+    text = ""
     if existing:
+        existing = ["_" + w.capitalize() + "_" for w in existing]
         text += f"{', '.join(existing)} {'is' if len(existing) == 1 else 'are'} already in the word list.\n"
-    if rejected:
-        text += f"{', '.join(rejected)} {'was' if len(rejected) == 1 else 'were'} rejected.\n"
-    for word, reason in rejected_with_reason:
-        text += f"{word} was rejected due to {reason}.\n"
-    await message.reply(text.rstrip())
+    if pending:
+        text += f"{', '.join(['_' + w.capitalize() + '_' for w in pending])} zaten onay bekliyor.\n"
+    rejected_without_reason = ["_" + w.capitalize() + "_" for w, reason in rejected if not reason]
+    if rejected_without_reason:
+        text += (
+            f"{', '.join(rejected_without_reason)} "
+            f"{'was' if len(rejected_without_reason) == 1 else 'were'} rejected.\n"
+        )
+    for word, reason in rejected:
+        if reason:
+            text += f"_{word.capitalize()}_ was rejected due to {reason}.\n"
+    return text
 
 
 @dp.message_handler(is_owner=True, commands=["addword", "addwords"])
 async def cmd_addwords(message: types.Message) -> None:
-    words_to_add = [w for w in set(message.get_args().lower().split()) if all(c in ascii_lowercase for c in w)]
+    rmsg = message.reply_to_message
+    if not message.get_args() and rmsg and rmsg.document:
+        await import_words(message, rmsg.document)
+        return
+    alphabet = get_words().alphabet
+    words_to_add = [w for w in set(alphabet.normalize(message.get_args()).split()) if alphabet.is_word(w)]
     if not words_to_add:
         return
-    existing = []
-    rejected = []
-    rejected_with_reason = []
-    for w in words_to_add[:]:  # Cannot iterate while deleting
-        if check_word_existence(w):
-            existing.append("_" + w.capitalize() + "_")
-            words_to_add.remove(w)
-    async with pool.acquire() as conn:
-        rej = await conn.fetch("SEÇİN kelime, kabul edilmeyen kelime listesinden neden;")
-    for word, reason in rej:
-        if word not in words_to_add:
-            continue
-        words_to_add.remove(word)
-        word = "_" + word.capitalize() + "_"
-        if reason:
-            rejected_with_reason.append((word, reason))
-        else:
-            rejected.append(word)
+    existing, rejected, pending, words_to_add = resolve_words(words_to_add)
+    words_to_add += pending  # Approved
     text = ""
     if words_to_add:
         async with pool.acquire() as conn:
-            await conn.copy_records_to_table("wordlist", records=[(w, True, None) for w in words_to_add])
+            await conn.copy_records_to_table(
+                "wordlist",
+                records=[(w, True, None, DEFAULT_LANGUAGE) for w in words_to_add],
+                columns=["word", "accepted", "reason", "language"],
+            )
+        PENDING_WORDS[DEFAULT_LANGUAGE].difference_update(words_to_add)
         text += f"Added {', '.join(['_' + w.capitalize() + '_' for w in words_to_add])} to the word list.\n"
-    if existing:
-        text += f"{', '.join(existing)} {'is' if len(existing) == 1 else 'are'} already in the word list.\n"
-    if rejected:
-        text += f"{', '.join(rejected)} {'was' if len(rejected) == 1 else 'were'} rejected.\n"
-    for word, reason in rejected_with_reason:
-        text += f"{word} was rejected due to {reason}.\n"
+    text += get_word_status_text(existing, rejected)
     msg = await message.reply(text.rstrip())
     if not words_to_add:
         return
-    await update_words()
+    get_words().add_words(words_to_add)
+    await notify_wordlist_changed()
     await msg.edit_text(msg.md_text + "\n\nKelime listesi güncellendi.")
     await bot.send_message(
         WORD_ADDITION_CHANNEL_ID,
@@ -854,30 +1027,226 @@ async def cmd_addwords(message: types.Message) -> None:
     )
 
 
+async def import_words(message: types.Message, document: types.Document) -> None:
+    # Add the words of an uploaded text file, one word per line
+    # The file is parsed in chunks and new words are copied to the database in batches,
+    # then merged into the word index in batches once all of them are stored, see constants.add_words.
+    alphabet = get_words().alphabet
+    msg = await message.reply("Dosya işleniyor...")
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    line_count = invalid_count = existing_count = rejected_count = 0
+    seen = set()
+    words_to_add = []
+    try:
+        await document.download(destination=path)
+        async with aiofiles.open(path, "rb") as f, pool.acquire() as conn, conn.transaction():
+            rest = b""
+            batch_start = 0
+            while True:
+                chunk = await f.read(1 << 16)
+                lines = (rest + chunk).split(b"\n")
+                rest = lines.pop() if chunk else b""  # Incomplete last line
+                line_count += sum(bool(line.strip()) for line in lines)
+                words = set()
+                for line in lines:
+                    word = alphabet.normalize(line.decode(errors="ignore").strip())
+                    if alphabet.is_word(word):
+                        words.add(word)
+                    elif word:
+                        invalid_count += 1
+                existing, rejected, pending, new = resolve_words(words - seen)
+                seen |= words
+                existing_count += len(existing)
+                rejected_count += len(rejected)
+                words_to_add += pending + new
+                batch = words_to_add[batch_start:]
+                if batch and (len(batch) >= WORD_IMPORT_BATCH_SIZE or not chunk):
+                    await conn.copy_records_to_table(
+                        "wordlist",
+                        records=[(w, True, None, DEFAULT_LANGUAGE) for w in batch],
+                        columns=["word", "accepted", "reason", "language"],
+                    )
+                    batch_start = len(words_to_add)
+                if not chunk:
+                    break
+    finally:
+        os.remove(path)
+
+    await add_words(get_words(), words_to_add)
+    PENDING_WORDS[DEFAULT_LANGUAGE].difference_update(words_to_add)
+    if words_to_add:
+        await notify_wordlist_changed()
+    if WORDS_ROLE == "builder" and len(words_to_add) >= WORD_IMPORT_BATCH_SIZE:
+        asyncio.create_task(rebuild_words())
+    await msg.edit_text(
+        f"{line_count} satır işlendi.\n"
+        f"Eklenen: {len(words_to_add)}\n"
+        f"Zaten kelime listesinde: {existing_count}\n"
+        f"Reddedilmiş: {rejected_count}\n"
+        f"Geçersiz: {invalid_count}"
+    )
+    if words_to_add:
+        await bot.send_message(
+            WORD_ADDITION_CHANNEL_ID,
+            f"Kelime listesine {len(words_to_add)} kelime eklendi.",
+            disable_notification=True,
+        )
+
+
 @dp.message_handler(is_owner=True, commands="rejword")
 async def cmd_rejword(message: types.Message) -> None:
     arg = message.get_args()
     word, _, reason = arg.partition(" ")
+    # Normalize like the word list so that the rejection matches the indexed word, e.g. Turkish dotted capital I
+    word = get_words().alphabet.normalize(word)
     if not word:
         return
-    word = word.lower()
     async with pool.acquire() as conn:
-        r = await conn.fetchrow("SEÇME kabul edildi, kelime listesinden neden NEREDE kelime = $1;", word)
+        r = await conn.fetchrow(
+            "SELECT accepted, reason FROM wordlist WHERE word = $1 AND language = $2;", word, DEFAULT_LANGUAGE
+        )
         if r is None:
             await conn.execute(
-                "INSERT INTO wordlist (kelime, kabul edildi, neden) VALUES ($1, false, $2)",
+                "INSERT INTO wordlist (word, accepted, reason, language) VALUES ($1, false, $2, $3);",
                 word,
                 reason.strip() or None,
+                DEFAULT_LANGUAGE,
             )
+    if r is None:
+        await remove_word(word, reason.strip() or None)
     word = word.capitalize()
     if r is None:
         await message.reply(f"_{word}_ reddedildi.")
-    elif r["kabul edildi"]:
-        await message.reply(f"_{word}_ kabul edildi.")
+    elif r["accepted"]:
+        await message.reply(f"_{word}_ zaten kabul edildi.")
     elif not r["reason"]:
         await message.reply(f"_{word}_ zaten reddedildi.")
     else:
-        await message.reply(f"_{word}_ nedeniyle zaten reddedildi {r['reason']}.")
+        await message.reply(f"_{word}_ zaten {r['reason']} nedeniyle reddedildi.")
+
+
+@dp.message_handler(is_owner=True, commands="delword")
+async def cmd_delword(message: types.Message) -> None:
+    word, _, reason = message.get_args().partition(" ")
+    word = get_words().alphabet.normalize(word)
+    if not word:
+        return
+    if not check_word_existence(word):
+        await message.reply(f"_{word.capitalize()}_ benim kelime listemde değil.")
+        return
+    # Mark as rejected so that the word stays removed when the word list is rebuilt
+    async with pool.acquire() as conn:
+        res = await conn.execute(
+            "UPDATE wordlist SET accepted = false, reason = $2 WHERE word = $1 AND language = $3;",
+            word,
+            reason.strip() or None,
+            DEFAULT_LANGUAGE,
+        )
+        if res == "UPDATE 0":
+            await conn.execute(
+                "INSERT INTO wordlist (word, accepted, reason, language) VALUES ($1, false, $2, $3);",
+                word,
+                reason.strip() or None,
+                DEFAULT_LANGUAGE,
+            )
+    await remove_word(word, reason.strip() or None)
+    await message.reply(f"_{word.capitalize()}_ kelime listesinden silindi.")
+
+
+async def remove_word(word: str, reason: Optional[str]) -> None:
+    # Word must already be marked as rejected in the database
+    get_words().remove_words([word])
+    REJECTED_WORDS[DEFAULT_LANGUAGE][word] = reason
+    PENDING_WORDS[DEFAULT_LANGUAGE].discard(word)
+    # Stop virtual players of running games from answering the word
+    for game in GAMES.values():
+        if game.language == DEFAULT_LANGUAGE:
+            game.remove_from_word_pools(word)
+    await notify_wordlist_changed()  # Other bot processes
+
+
+@dp.message_handler(is_group=True, is_admin=True, commands=["addgroupword", "addgroupwords"])
+async def cmd_addgroupwords(message: types.Message) -> None:
+    # Words are only added for this group, and words removed by /delgroupword are allowed again
+    alphabet = get_words().alphabet
+    words = [w for w in set(alphabet.normalize(message.get_args()).split()) if alphabet.is_word(w)]
+    if not words:
+        await message.reply(
+            "İşlev: Kelimeleri yalnızca bu grubun kelime listesine ekleyin.\n"
+            "Kullanım: `/addgroupword kelimebir kelimeiki ...`"
+        )
+        return
+    group_id = message.chat.id
+    overlay = await get_overlay(group_id)
+    index = get_words()
+    existing = [w for w in words if overlay.contains(index, w)]
+    words = [w for w in words if not overlay.contains(index, w)]
+    if words:
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "DELETE FROM groupwordlist WHERE group_id = $1 AND language = $2 AND word = ANY($3::TEXT[]);",
+                group_id, DEFAULT_LANGUAGE, words,
+            )
+            await conn.copy_records_to_table(
+                "groupwordlist",
+                records=[(group_id, DEFAULT_LANGUAGE, w, True) for w in words if w not in index],
+                columns=["group_id", "language", "word", "accepted"],
+            )
+        overlay.removed.difference_update(words)
+        overlay.added.update(w for w in words if w not in index)
+        game = GAMES.get(group_id)
+        if game and game.language == DEFAULT_LANGUAGE:
+            game.word_pools.clear()  # Rebuilt with the added words
+        await notify_group_wordlist_changed(group_id)
+    text = ""
+    if words:
+        text += f"Bu grubun kelime listesine eklendi: {', '.join('_' + w.capitalize() + '_' for w in words)}\n"
+    if existing:
+        text += f"Zaten kelime listesinde: {', '.join('_' + w.capitalize() + '_' for w in existing)}\n"
+    await message.reply(text.rstrip())
+
+
+@dp.message_handler(is_group=True, is_admin=True, commands=["delgroupword", "delgroupwords"])
+async def cmd_delgroupwords(message: types.Message) -> None:
+    # Words are only removed for this group, and words added by /addgroupword are removed again
+    alphabet = get_words().alphabet
+    words = [w for w in set(alphabet.normalize(message.get_args()).split()) if alphabet.is_word(w)]
+    if not words:
+        await message.reply(
+            "İşlev: Kelimeleri yalnızca bu grubun kelime listesinden silin.\n"
+            "Kullanım: `/delgroupword kelimebir kelimeiki ...`"
+        )
+        return
+    group_id = message.chat.id
+    overlay = await get_overlay(group_id)
+    index = get_words()
+    missing = [w for w in words if not overlay.contains(index, w)]
+    words = [w for w in words if overlay.contains(index, w)]
+    if words:
+        async with pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "DELETE FROM groupwordlist WHERE group_id = $1 AND language = $2 AND word = ANY($3::TEXT[]);",
+                group_id, DEFAULT_LANGUAGE, words,
+            )
+            await conn.copy_records_to_table(
+                "groupwordlist",
+                records=[(group_id, DEFAULT_LANGUAGE, w, False) for w in words if w in index],
+                columns=["group_id", "language", "word", "accepted"],
+            )
+        overlay.added.difference_update(words)
+        overlay.removed.update(w for w in words if w in index)
+        game = GAMES.get(group_id)
+        if game and game.language == DEFAULT_LANGUAGE:
+            for word in words:
+                game.remove_from_word_pools(word)
+        await notify_group_wordlist_changed(group_id)
+    text = ""
+    if words:
+        text += f"Bu grubun kelime listesinden silindi: {', '.join('_' + w.capitalize() + '_' for w in words)}\n"
+    if missing:
+        text += f"Kelime listesinde değil: {', '.join('_' + w.capitalize() + '_' for w in missing)}\n"
+    await message.reply(text.rstrip())
 
 
 @dp.message_handler(commands="feedback")
@@ -915,56 +1284,56 @@ async def message_handler(message: types.Message) -> None:
             and message.from_user.id == GAMES[group_id].players_in_game[0].user_id
             and not GAMES[group_id].answered
             and GAMES[group_id].accepting_answers
-            # TODO: Modify to support other languages
-            and all([c in ascii_lowercase for c in message.text.lower()])
+            and GAMES[group_id].alphabet.is_word(GAMES[group_id].alphabet.normalize(message.text))
     ):
         await GAMES[group_id].handle_answer(message)
 
 
 @dp.inline_handler()
 async def inline_handler(inline_query: types.InlineQuery):
-    text = inline_query.query.lower()
+    alphabet = get_words().alphabet
+    text = alphabet.normalize(inline_query.query)
     if not text or inline_query.from_user.id not in VIP and (await amt_donated(inline_query.from_user.id)) < 10:
         await inline_query.answer(
             [
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startclassic",
                     title="Klasik bir oyun başlatın",
                     description="/startclassic@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startclassic@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="starthard",
                     title="Zor mod oyunu başlat",
                     description="/starthard@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/starthard@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startchaos",
                     title="Bir kaos oyunu başlatın",
                     description="/startchaos@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startchaos@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startcfl",
                     title="Seçtiğiniz ilk harf oyununu başlatın",
                     description="/startcfl@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startcfl@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startbl",
                     title="Yasaklı mektup oyunu başlat",
                     description="/startbl@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startbl@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startrl",
                     title="Gerekli bir harf oyununu başlatın",
                     description="/startrl@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startrl@NightWordBot"),
                 ),
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
+                    id="startelim",
                     title="Bir eleme oyunu başlat",
                     description="/startelim@NightWordBot",
                     input_message_content=types.InputTextMessageContent("/startelim@NightWordBot"),
@@ -974,12 +1343,12 @@ async def inline_handler(inline_query: types.InlineQuery):
         )
         return
 
-    if any(c not in ascii_lowercase for c in text):
+    if any(c not in alphabet.indexes and c not in "?*" for c in text):
         await inline_query.answer(
             [
                 types.InlineQueryResultArticle(
-                    id=str(uuid4()),
-                    title="Bir sorgu yalnızca alfabelerden oluşabilir",
+                    id="invalid",
+                    title="Bir sorgu yalnızca alfabelerden ve ? * işaretlerinden oluşabilir",
                     description="Farklı bir sorgu dene",
                     input_message_content=types.InputTextMessageContent(r"¯\\_(ツ)\_/¯"),
                 )
@@ -988,29 +1357,41 @@ async def inline_handler(inline_query: types.InlineQuery):
         )
         return
 
-    res = []
-    for i in filter_words(starting_letter=text[0]):
-        if i.startswith(text):
-            i = i.capitalize()
-            res.append(
-                types.InlineQueryResultArticle(
-                    id=str(uuid4()),
-                    title=i,
-                    input_message_content=types.InputTextMessageContent(i),
-                )
-            )
-            if len(res) == 50:  # Max 50 results
-                break
-    if not res:  # No results
-        res.append(
+    offset = int(inline_query.offset) if inline_query.offset.isdigit() else 0
+    res, next_offset = get_inline_page(text, offset, get_words().version)
+    if not res and not offset:  # No results
+        res = (
             types.InlineQueryResultArticle(
-                id=str(uuid4()),
+                id="noresults",
                 title="Sonuç bulunamadı",
                 description="Farklı bir sorgu dene",
                 input_message_content=types.InputTextMessageContent(r"¯\\_(ツ)\_/¯"),
-            )
+            ),
         )
-    await inline_query.answer(res, is_personal=True)
+    await inline_query.answer(list(res), cache_time=INLINE_CACHE_TIME, is_personal=True, next_offset=next_offset)
+
+
+@lru_cache(maxsize=INLINE_PAGE_CACHE_SIZE)
+def get_inline_page(
+    text: str, offset: int, words_version: int
+) -> Tuple[Tuple[types.InlineQueryResultArticle, ...], str]:
+    # Inline results of a query from offset on and the offset of the next page, empty if it is the last page
+    # words_version is only part of the cache key, so pages are rendered again after the word list changes
+    words = get_words()
+    if "?" in text or "*" in text:  # Wildcard pattern
+        ordinals = words.search(text)
+    else:
+        ordinals = words.get_prefix_ordinals(text)
+    page = words.get_words_at(ordinals[offset:offset + INLINE_RESULTS_PER_PAGE])
+    res = tuple(
+        types.InlineQueryResultArticle(
+            id=word,  # Stable across pages and cached answers
+            title=word.capitalize(),
+            input_message_content=types.InputTextMessageContent(word.capitalize()),
+        )
+        for word in page
+    )
+    return res, str(offset + len(page)) if offset + len(page) < len(ordinals) else ""
 
 
 @dp.callback_query_handler()
@@ -1064,13 +1445,7 @@ async def error_handler(update: types.Update, error: TelegramAPIError) -> None:
         asyncio.create_task(
             send_admin_msg.reply(f"Sonuç olarak {update.message.chat.id} içinde oyunu öldürmek.")
         )
-        GAMES[update.message.chat.id].state = GameState.KILLGAME
-        await asyncio.sleep(2)
-        try:
-            del GAMES[update.message.chat.id]
-            await update.message.reply("Oyun zorla sona erdi.")
-        except:
-            pass
+        await GAMES[update.message.chat.id].kill()
 
 
 def main() -> None:
@@ -0,0 +1,31 @@
+from definitions import DEFINITIONS_PER_BLOCK, Definitions, build_definitions
+
+
+def test_definitions_lookup(tmp_path) -> None:
+    source = tmp_path / "definitions.tsv"
+    word_list = [f"{a}{b}{c}" for a in "abcdz" for b in "aeiou" for c in "lmnrst"]
+    lines = [f"{w}\tdefinition of {w}\n" for w in word_list]
+    lines += [
+        "Cow\tA farm animal.\n", "cow\t  Also to   intimidate. \n", "bad word\tskipped\n", "dog\t\n", "ağaç\ttree\n"
+    ]
+    source.write_text("".join(lines), encoding="utf-8")
+    path = str(tmp_path / "definitions.dat")
+    assert build_definitions(str(source), path, "en") == len(word_list) + 1
+    assert len(word_list) > 2 * DEFINITIONS_PER_BLOCK  # Lookups cross blocks
+
+    definitions = Definitions(path)
+    assert len(definitions) == len(word_list) + 1
+    for word in word_list:
+        assert definitions.get(word) == f"definition of {word}"
+    assert definitions.get("cow") == "A farm animal.\nAlso to intimidate."
+    for word in ["dog", "aaa", "zzz", "zzt", "zuu", "eat", "", "ağaç", "bad word"]:
+        assert definitions.get(word) is None, word
+
+    tr_path = str(tmp_path / "definitions.tr.dat")
+    # "ağaç" is a Turkish word and "cow" is not
+    assert build_definitions(str(source), tr_path, "tr") == len(word_list) + 1
+    tr_definitions = Definitions(tr_path)
+    assert tr_definitions.get("ağaç") == "tree"
+    assert tr_definitions.get("cow") is None
+    for word in word_list:
+        assert tr_definitions.get(word) == f"definition of {word}"
@@ -0,0 +1,105 @@
+import random
+from typing import Callable
+
+from timers import TIMER_LEVELS, TIMER_RESOLUTION, TIMER_SLOT_BITS, Timer, TimerWheel
+
+
+class Handle:
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeLoop:
+    # Event loop with a manually moved clock, tasks of fired timers are run right away
+    def __init__(self, now: float) -> None:
+        self.now = now
+        self.handle = None
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when: float, callback) -> Handle:
+        self.handle = Handle(when, callback)
+        return self.handle
+
+    def create_task(self, coro) -> None:
+        # Callbacks of the tests never suspend
+        try:
+            coro.send(None)
+        except StopIteration:
+            pass
+
+    def run_until(self, when: float) -> None:
+        # Wake the wheel each time its loop timer is due, like the event loop would
+        while self.handle and not self.handle.cancelled and self.handle.when <= when:
+            self.now = max(self.now, self.handle.when)
+            handle = self.handle
+            self.handle = None
+            handle.callback()
+        self.now = max(self.now, when)
+
+
+def schedule(wheel: TimerWheel, when: float, fired: list, name: object) -> Timer:
+    # Timer appending its name and firing time to fired
+    async def callback() -> None:
+        fired.append((name, wheel.now()))
+
+    return wheel.schedule(when, callback)
+
+
+def test_fires_in_order_and_never_early() -> None:
+    loop = FakeLoop(1000.0)
+    wheel = TimerWheel(loop)
+    fired = []
+    deadlines = {}
+    rng = random.Random(1)
+    for i in range(2000):
+        deadlines[i] = loop.now + rng.uniform(0, 5000)
+        schedule(wheel, deadlines[i], fired, i)
+    loop.run_until(loop.now + 5001)
+    assert sorted(name for name, _ in fired) == list(range(2000))
+    for name, when in fired:
+        assert deadlines[name] - 1e-9 <= when <= deadlines[name] + TIMER_RESOLUTION + 1e-9
+
+
+def test_cancelled_timers_do_not_fire() -> None:
+    loop = FakeLoop(0.0)
+    wheel = TimerWheel(loop)
+    fired = []
+    schedule(wheel, 10, fired, "kept")
+    schedule(wheel, 5, fired, "cancelled").cancel()
+    loop.run_until(20)
+    assert [name for name, _ in fired] == ["kept"]
+
+
+def test_short_timers_across_level_boundaries() -> None:
+    # Timers of a few seconds must work whichever level boundary they cross, including the top one
+    for level in range(1, TIMER_LEVELS + 1):
+        boundary = (1 << (TIMER_SLOT_BITS * level)) * TIMER_RESOLUTION
+        loop = FakeLoop(boundary - 5)
+        wheel = TimerWheel(loop)
+        fired = []
+        schedule(wheel, loop.now + 30, fired, "across")
+        schedule(wheel, loop.now + 2, fired, "before")
+        loop.run_until(boundary - 5 + 31)
+        assert [name for name, _ in fired] == ["before", "across"]
+        assert fired[1][1] >= boundary - 5 + 30 - 1e-6
+
+
+def test_far_ahead_timers() -> None:
+    # Timers beyond the span of the wheels wait in the overflow list
+    loop = FakeLoop(0.0)
+    wheel = TimerWheel(loop)
+    fired = []
+    span = (1 << (TIMER_SLOT_BITS * TIMER_LEVELS)) * TIMER_RESOLUTION
+    schedule(wheel, span * 2.5, fired, "far")
+    loop.run_until(span * 2.5 - 1)
+    assert fired == []
+    loop.run_until(span * 2.5 + 1)
+    assert [name for name, _ in fired] == ["far"]
+    assert fired[0][1] >= span * 2.5 - 1e-6
@@ -0,0 +1,332 @@
+import mmap
+import random
+import re
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+import words
+from words import ALPHABETS, WordIndex
+
+
+def build(word_list: List[str], language: str = "en") -> WordIndex:
+    return WordIndex.build(word_list, ALPHABETS[language])
+
+
+def test_membership_and_ordinals() -> None:
+    word_list = ["cat", "dog", "hammer", "ha", "zebra", "ağaç"]
+    index = build([w for w in word_list if w.isascii()])
+    assert len(index) == 5
+    for word in word_list[:5]:
+        assert word in index
+        assert index[index.ordinal(word)] == word
+    # Prefixes of words in other blocks, words longer than any word and words with other letters
+    for word in ["ham", "hammers", "do", "zebras", "c", "", "ağaç", "Cat"]:
+        assert word not in index, word
+    assert [index[o] for o in range(len(index))] == ["cat", "dog", "ha", "hammer", "zebra"]
+
+
+def test_lemmas_group_inflections() -> None:
+    index = build("cat cats catting fly flies flied bake baked baking thing things".split())
+    for group in (["cat", "cats", "catting"], ["fly", "flies", "flied"], ["bake", "baked", "baking"],
+                  ["thing", "things"]):
+        assert {index.get_lemma(w) for w in group} == {index.get_lemma(group[0])}, group
+    tr_words = ["kitap", "kitaplar", "kitabın", "ev", "evler", "evde"]
+    tr_index = build(tr_words, "tr")
+    assert tr_index.get_lemma("kitaplar") == tr_index.get_lemma("kitabın") == tr_index.get_lemma("kitap")
+    assert tr_index.get_lemma("evler") == tr_index.get_lemma("evde") == tr_index.get_lemma("ev")
+
+
+def test_lemmas_of_unrelated_words_differ() -> None:
+    # Words that only end like inflections of another word
+    pairs = [
+        ("thing", "the"), ("things", "the"), ("news", "new"), ("letter", "let"), ("summer", "sum"),
+        ("corner", "corn"), ("number", "numb"), ("evening", "even"), ("being", "bee"), ("better", "bet"),
+        ("hammer", "ham"),
+    ]
+    index = build({w for pair in pairs for w in pair})
+    for word, other in pairs:
+        assert index.get_lemma(word) != index.get_lemma(other), (word, other)
+
+    tr_pairs = [("kapı", "kap"), ("kara", "kar"), ("kasa", "kas"), ("kale", "kal"), ("bile", "bil")]
+    tr_index = build({w for pair in tr_pairs for w in pair}, "tr")
+    for word, other in tr_pairs:
+        assert tr_index.get_lemma(word) != tr_index.get_lemma(other), (word, other)
+
+
+def test_lemmas_of_added_words() -> None:
+    index = build(["cat", "dog", "hammer"])
+    index.add_words(["cats", "ham"])
+    assert index.get_lemma("cats") == index.get_lemma("cat")
+    assert index.get_lemma("ham") != index.get_lemma("hammer")
+
+
+def random_words(count: int, seed: int = 0, letters: str = "abcdefghij") -> List[str]:
+    rng = random.Random(seed)
+    return sorted({"".join(rng.choices(letters, k=rng.randint(1, 9))) for _ in range(count)})
+
+
+def changed_index() -> Tuple[WordIndex, List[str]]:
+    # Index with added and removed words, and the words it holds
+    all_words = random_words(3000)
+    index = build(all_words[::2])
+    index.add_words(all_words[1::2][:700])
+    index.add_words(all_words[1::2][700:])  # Second batch extends the arrays of added words
+    removed = all_words[::7]
+    index.remove_words(removed)
+    index.add_words(removed[::3])  # Removed words can be added back
+    kept = sorted(set(all_words) - set(removed) | set(removed[::3]))
+    return index, kept
+
+
+def test_incremental_changes() -> None:
+    index, kept = changed_index()
+    assert len(index) == len(kept)
+    assert all(w in index for w in kept)
+    assert sorted(index.get_words_at(index.filter())) == kept
+    for letter in "aej":
+        assert sorted(index.iter_letter(letter)) == [w for w in kept if w[0] == letter]
+    assert sorted(index.get_words_at(index.get_prefix_ordinals("ab"))) == [w for w in kept if w.startswith("ab")]
+
+
+def test_rejected_word_is_removed() -> None:
+    # /rejword normalizes its argument with the alphabet of the language before removing the word
+    alphabet = ALPHABETS["tr"]
+    index = build(["istanbul", "ırmak", "ışık"], "tr")
+    word = alphabet.normalize("İSTANBUL")
+    assert word == "istanbul" != "İSTANBUL".lower()
+    index.remove_words([alphabet.normalize("IŞIK"), word])
+    assert word not in index and "ışık" not in index and "ırmak" in index
+    assert len(index) == 1 and index.count(starting_letter="i") == 0
+    assert index.get_words_at(index.filter()) == ["ırmak"]
+
+
+def matching(words: List[str], min_len: int, starting_letter: str, banned: str, required: str) -> List[str]:
+    return [
+        w for w in words if len(w) >= min_len and (not starting_letter or w[0] == starting_letter)
+        and not set(banned) & set(w) and set(required) <= set(w)
+    ]
+
+
+def test_filter_and_count_with_changes() -> None:
+    index, kept = changed_index()
+    for min_len, starting_letter, banned, required in [
+        (1, None, "", ""), (4, "a", "", ""), (3, "b", "cd", ""), (2, None, "e", "f"), (5, "c", "", "ag"),
+        (1, "d", "abefgh", "c"), (6, None, "abcd", "ef"),
+    ]:
+        ordinals = index.filter(min_len, starting_letter, banned, required[:1] or None)
+        assert sorted(index.get_words_at(ordinals)) == matching(kept, min_len, starting_letter, banned, required[:1])
+        expected = len(matching(kept, min_len, starting_letter, banned, required))
+        assert index.count(min_len, starting_letter, banned, required) == expected
+        lower, upper = index.count_bounds(min_len, starting_letter, banned, required)
+        assert lower <= expected <= upper
+
+
+def test_sample_draws_only_valid_words(monkeypatch) -> None:
+    monkeypatch.setattr(words, "rng", np.random.default_rng(0))
+    index, kept = changed_index()
+    excluded = np.packbits(np.isin(np.arange(len(index.masks) + len(index.extra_words)), index.filter(1, "a")[::2]))
+    expected = set(matching(kept, 3, "a", "bc", "d")) - set(index.get_words_at(index.filter(1, "a")[::2]))
+    drawn = set(index.get_words_at(list(index.sample(3, "a", "bc", "d", excluded=excluded))))
+    assert drawn and drawn <= expected
+    # Draws cover the valid words uniformly enough to reach most of them
+    drawn = [index[o] for _ in range(200) for o in index.sample(2, "e")]
+    assert set(drawn) <= set(matching(kept, 2, "e", "", ""))
+    assert len(set(drawn)) > 0.9 * len(matching(kept, 2, "e", "", ""))
+    assert list(index.sample(1, "a", "a")) == []
+
+
+def test_count_tables() -> None:
+    word_list = random_words(5000, seed=1, letters="abcdefghijklmnopqrstuvwxyz")
+    word_list += random_words(500, seed=2, letters="aeiourstln")  # Longer words sharing letters
+    word_list = sorted(set(word_list))
+    index = build(word_list)
+    rng = random.Random(3)
+    for _ in range(300):
+        min_len = rng.randint(1, 14)
+        starting_letter = rng.choice([None, *"aest"])
+        letters = rng.sample("aeiourstlnbc", rng.randint(0, 6))
+        split = rng.randint(0, len(letters))
+        banned, required = "".join(letters[:split]), "".join(letters[split:])
+        expected = len(matching(word_list, min_len, starting_letter, banned, required))
+        lower, upper = index.count_bounds(min_len, starting_letter, banned, required)
+        assert lower <= expected <= upper
+        if len(banned) + len(set(required) - {starting_letter}) <= 3 and min_len <= 12:
+            assert lower == upper == expected
+        assert index.count(min_len, starting_letter, banned, required) == expected
+        assert index.has_at_least(expected, min_len, starting_letter, banned, required)
+        assert not index.has_at_least(expected + 1, min_len, starting_letter, banned, required)
+
+
+def osa_distance(a: str, b: str) -> int:
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_edit_distance() -> None:
+    rng = random.Random(4)
+    for _ in range(2000):
+        a, b = ("".join(rng.choices("abc", k=rng.randint(0, 6))) for _ in range(2))
+        assert words.get_edit_distance(a, b, 2) == min(osa_distance(a, b), 3), (a, b)
+
+
+def test_suggest() -> None:
+    index, kept = changed_index()
+    rng = random.Random(5)
+    for word in rng.sample(kept, 30) + ["abcdefghij", "jihgfedcbaab", "a"]:
+        expected = sorted((d, w) for w in kept if w != word and (d := osa_distance(word, w)) <= 2)
+        assert index.suggest(word, limit=len(kept)) == [w for _, w in expected], word
+        assert index.suggest(word) == [w for _, w in expected[:3]]
+        assert index.suggest(word, starting_letter="b", min_len=4, exclude_words=set(kept[::2]), limit=len(kept)) == [
+            w for _, w in expected if w[0] == "b" and len(w) >= 4 and w not in kept[::2]
+        ]
+        assert index.suggest(word, banned_letters="cd", required_letter="e", limit=len(kept)) == [
+            w for _, w in expected if not {"c", "d"} & set(w) and "e" in w
+        ]
+
+
+def test_empty_index() -> None:
+    index = build([])
+    assert len(index) == 0 and "cat" not in index
+    assert index.count() == 0 and len(index.filter()) == 0
+    assert index.suggest("cat") == [] and len(index.search("c*")) == 0 and len(index.get_prefix_ordinals("ca")) == 0
+    index.add_words(["cat"])
+    assert "cat" in index and index.suggest("cot") == ["cat"] and index.get_words_at(index.search("c*")) == ["cat"]
+
+
+def test_wildcard_search() -> None:
+    index, kept = changed_index()
+    for pattern in ["a*", "*a", "a?c*", "*ab*c*", "?b?", "*", "??*?e", "a*b*a", "abc", "*e*e*", "j*?", "a*x", "A*"]:
+        regex = re.compile(".*".join(re.escape(s).replace(r"\?", ".") for s in pattern.split("*")))
+        expected = [w for w in kept if regex.fullmatch(w)]
+        assert sorted(index.get_words_at(index.search(pattern))) == expected, pattern
+        assert sorted(index.get_words_at(index.search(pattern, min_len=3, max_len=5, banned_letters="d"))) == [
+            w for w in expected if 3 <= len(w) <= 5 and "d" not in w
+        ], pattern
+        assert sorted(index.get_words_at(index.search(pattern, required_letters="fg"))) == [
+            w for w in expected if "f" in w and "g" in w
+        ], pattern
+
+
+def test_wildcard_search_of_added_long_words() -> None:
+    index = build(["cat", "cart", "dog"])
+    index.add_words(["caterpillar", "cartographer"])
+    assert sorted(index.get_words_at(index.search("ca*r"))) == ["cartographer", "caterpillar"]
+    assert sorted(index.get_words_at(index.search("c*"))) == ["cart", "cartographer", "cat", "caterpillar"]
+    assert index.get_words_at(index.search("?????????????r")) == []
+    assert index.get_words_at(index.search("c*", max_len=11)) == ["cat", "cart", "caterpillar"]
+
+
+def test_alias_table_distribution(monkeypatch) -> None:
+    monkeypatch.setattr(words, "rng", np.random.default_rng(6))
+    weights = np.array([1, 0, 5, 2, 0.5, 11.5], dtype=np.float64)
+    table = words.AliasTable(weights)
+    assert len(table) == len(weights)
+    frequencies = np.bincount(table.draw(200000), minlength=len(weights)) / 200000
+    assert np.allclose(frequencies, weights / weights.sum(), atol=0.005)
+
+
+def test_word_sampler(monkeypatch) -> None:
+    monkeypatch.setattr(words, "rng", np.random.default_rng(7))
+    counts = {"apple": 50, "avocado": 1, "banana": 10, "berry": 10, "cherry": 1, "apricot": 5}
+    sampler = words.WordSampler(counts, ALPHABETS["en"])
+    assert len(sampler) == len(counts)
+    popular = [w for _ in range(50) for w in sampler.sample("popular", starting_letter="a")]
+    assert set(popular) <= {"apple", "avocado", "apricot"}
+    assert popular.count("apple") > 5 * popular.count("apricot") > 0
+    rare = [w for _ in range(50) for w in sampler.sample("rare", starting_letter="a")]
+    assert rare.count("avocado") > rare.count("apple")
+    assert {w for _ in range(20) for w in sampler.sample("popular", 6, None, "o", "r")} == {"cherry"}
+    assert list(sampler.sample("popular", starting_letter="z")) == []
+
+
+def test_word_sampler_rebuilds_changed_letters() -> None:
+    counts = {"apple": 50, "avocado": 1, "banana": 10, "berry": 10, "cherry": 1, "apricot": 5}
+    previous = words.WordSampler(counts, ALPHABETS["en"])
+    counts.update(banana=12, blueberry=3)
+    sampler = words.WordSampler({w: c for w, c in counts.items() if w[0] == "b"}, ALPHABETS["en"], previous)
+    expected = words.WordSampler(counts, ALPHABETS["en"])
+    assert sampler.words == expected.words
+    assert sampler.tables["a", "popular"] is previous.tables["a", "popular"]
+    for key, weighting in expected.tables:
+        assert np.array_equal(sampler.tables[key, weighting].prob, expected.tables[key, weighting].prob)
+        assert np.array_equal(sampler.tables[key, weighting].alias, expected.tables[key, weighting].alias)
+
+
+def test_blocklist() -> None:
+    # Patterns sharing prefixes and suffixes exercise the failure links of the automaton
+    blocklist = ["abce", "bc", "cab", "jjj", "dad", "adda"]
+    all_words = random_words(4000, seed=8)
+    index = WordIndex.build(all_words[::2], ALPHABETS["en"], blocklist)
+    index.add_words(all_words[1::2])
+    for word in all_words + ["abcd", "xabcex", "jj", "addad", "ağaç"]:
+        assert index.is_safe(word) == (not any(p in word for p in blocklist)), word
+    safe = [w for w in all_words if not any(p in w for p in blocklist)]
+    assert sorted(index.get_words_at(index.filter(safe_only=True))) == safe
+    assert all(index.is_safe(index[o]) for o in index.sample(1, "a", safe_only=True))
+    assert WordIndex.build(["abc"], ALPHABETS["en"]).is_safe("abc")
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    word_list = random_words(2000, seed=9)
+    index = WordIndex.build(word_list, ALPHABETS["en"], ["ab"])
+    path = str(tmp_path / "words.snapshot")
+    index.save(path, {"word_count": len(word_list)})
+    loaded, manifest = WordIndex.load(path)
+    assert manifest == {"word_count": len(word_list)}
+    assert [loaded[o] for o in range(len(loaded))] == [index[o] for o in range(len(index))]
+    assert loaded.count(3, "a", "b", "c") == index.count(3, "a", "b", "c")
+    assert loaded.suggest(word_list[5]) == index.suggest(word_list[5])
+    assert [loaded.is_safe(w) for w in word_list] == [index.is_safe(w) for w in word_list]
+    assert [loaded.get_lemma(w) for w in word_list] == [index.get_lemma(w) for w in word_list]
+
+    with open(path, "r+b") as f:
+        f.seek(-1, 2)
+        last = f.read(1)
+        f.seek(-1, 2)
+        f.write(bytes([last[0] ^ 1]))
+    with pytest.raises(ValueError):
+        WordIndex.load(path)
+
+
+def test_snapshot_load_closes_map_on_failure(tmp_path, monkeypatch) -> None:
+    maps = []
+
+    class RecordingMap(mmap.mmap):
+        def __init__(self, *args, **kwargs) -> None:
+            maps.append(self)
+
+    monkeypatch.setattr(words.mmap, "mmap", RecordingMap)
+    path = str(tmp_path / "words.snapshot")
+    with open(path, "wb") as f:
+        f.write(b"NWDICT")  # Truncated header
+    with pytest.raises(ValueError):
+        WordIndex.load(path)
+    build(["cat", "dog"]).save(path, {})
+    with open(path, "r+b") as f:
+        f.seek(-1, 2)
+        last = f.read(1)
+        f.seek(-1, 2)
+        f.write(bytes([last[0] ^ 1]))  # Checksum mismatch
+    with pytest.raises(ValueError):
+        WordIndex.load(path)
+    assert len(maps) == 2 and all(mm.closed for mm in maps)
+
+
+def test_overlay() -> None:
+    index = build(["cat", "cow", "dog", "ant"])
+    overlay = words.WordOverlay(added=["cab", "cat", "crab"], removed=["cow", "cub"])
+    assert overlay.contains(index, "cab") and overlay.contains(index, "cat") and overlay.contains(index, "dog")
+    assert not overlay.contains(index, "cow") and not overlay.contains(index, "cub")
+    # "cat" is already in the index and "cub" is not, so neither changes the count
+    assert overlay.count_difference(index, starting_letter="c") == 1
+    assert overlay.count_difference(index, 4, "c") == 1
+    assert overlay.count_difference(index, 1, "c", banned_letters="r") == 0
+    assert overlay.count_difference(index, 1, "c", required_letters="o") == -1
+    assert not words.WordOverlay() and overlay
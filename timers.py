@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import math
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hierarchical timer wheel: TIMER_LEVELS wheels of 2 ** TIMER_SLOT_BITS slots, a slot of level l spans
+# 2 ** (TIMER_SLOT_BITS * l) ticks of TIMER_RESOLUTION seconds, so the wheels cover blocks of about 19 days.
+# A timer is kept at the highest level where its tick differs from the current tick, and moved down a level
+# each time the current tick enters its slot, so scheduling and firing are O(1) however many timers are pending.
+# Timers in a later block than the current tick, i.e. far ahead or just past a block boundary, are kept in an
+# overflow list that is inserted again each time the current tick enters a new block.
+TIMER_RESOLUTION = 0.1
+TIMER_SLOT_BITS = 6
+TIMER_LEVELS = 4
+TIMER_SLOTS = 1 << TIMER_SLOT_BITS
+
+
+class Timer:
+    def __init__(self, tick: int, callback: Callable[[], Awaitable[None]]) -> None:
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        # Cancelled timers stay in their slot and are dropped when it is processed
+        self.cancelled = True
+
+
+class TimerWheel:
+    # Owns the deadlines of all games with one event loop timer armed for the earliest slot with timers,
+    # so the process only wakes up when something is due
+    # Callbacks run as separate tasks so that a slow callback never delays other timers.
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.wheels: List[List[List[Timer]]] = [[[] for _ in range(TIMER_SLOTS)] for _ in range(TIMER_LEVELS)]
+        self.overflow: List[Timer] = []
+        self.tick = self.get_tick(loop.time())  # Last processed tick
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.handle_tick: Optional[int] = None
+
+    def now(self) -> float:
+        return self.loop.time()
+
+    @staticmethod
+    def get_tick(when: float) -> int:
+        return math.floor(when / TIMER_RESOLUTION)
+
+    def schedule(self, when: float, callback: Callable[[], Awaitable[None]]) -> Timer:
+        # Run callback at loop time when, never earlier, or as soon as possible if when has passed
+        self.advance(self.get_tick(self.now()))
+        timer = Timer(max(math.ceil(when / TIMER_RESOLUTION), self.tick + 1), callback)
+        self.insert(timer)
+        self.arm()
+        return timer
+
+    def insert(self, timer: Timer) -> None:
+        diff = timer.tick ^ self.tick
+        level = (diff.bit_length() - 1) // TIMER_SLOT_BITS if diff else 0
+        if level >= TIMER_LEVELS:
+            self.overflow.append(timer)
+            return
+        self.wheels[level][(timer.tick >> (TIMER_SLOT_BITS * level)) & (TIMER_SLOTS - 1)].append(timer)
+
+    def get_next_tick(self) -> Optional[int]:
+        # Earliest tick at which a slot with timers has to be processed
+        # Slots of a level at or before the digit of the current tick are always empty, and every slot of a level
+        # is due before any slot of the levels above.
+        for level, wheel in enumerate(self.wheels):
+            shift = TIMER_SLOT_BITS * level
+            digit = (self.tick >> shift) & (TIMER_SLOTS - 1)
+            block_start = self.tick >> (shift + TIMER_SLOT_BITS) << (shift + TIMER_SLOT_BITS)
+            for d in range(digit + 1, TIMER_SLOTS):
+                if wheel[d]:
+                    return block_start | (d << shift)
+        if self.overflow:
+            # Start of the next block
+            shift = TIMER_SLOT_BITS * TIMER_LEVELS
+            return ((self.tick >> shift) + 1) << shift
+        return None
+
+    def advance(self, tick: int) -> None:
+        # Process every slot due up to tick, skipping empty slots without visiting them
+        while True:
+            next_tick = self.get_next_tick()
+            if next_tick is None or next_tick > tick:
+                self.tick = max(self.tick, tick)
+                return
+            self.tick = next_tick
+            # Move the timers of the slots the current tick entered down, highest level first
+            if next_tick & ((1 << (TIMER_SLOT_BITS * TIMER_LEVELS)) - 1) == 0:
+                timers = self.overflow
+                self.overflow = []
+                for timer in timers:
+                    if not timer.cancelled:
+                        self.insert(timer)
+            for level in range(TIMER_LEVELS - 1, 0, -1):
+                shift = TIMER_SLOT_BITS * level
+                if next_tick & ((1 << shift) - 1) == 0:
+                    slot = self.wheels[level][(next_tick >> shift) & (TIMER_SLOTS - 1)]
+                    timers = slot[:]
+                    slot.clear()
+                    for timer in timers:
+                        if not timer.cancelled:
+                            self.insert(timer)
+            slot = self.wheels[0][next_tick & (TIMER_SLOTS - 1)]
+            timers = slot[:]
+            slot.clear()
+            for timer in timers:
+                if not timer.cancelled:
+                    self.loop.create_task(self.run(timer))
+
+    async def run(self, timer: Timer) -> None:
+        try:
+            await timer.callback()
+        except Exception:
+            logger.exception("Timer callback failed")
+
+    def arm(self) -> None:
+        # Keep the event loop timer set for the next tick to process
+        next_tick = self.get_next_tick()
+        if next_tick == self.handle_tick:
+            return
+        if self.handle:
+            self.handle.cancel()
+        self.handle = None if next_tick is None else self.loop.call_at(next_tick * TIMER_RESOLUTION, self.wake)
+        self.handle_tick = next_tick
+
+    def wake(self) -> None:
+        # Clock resolution may wake the loop timer slightly before the tick
+        tick = max(self.get_tick(self.now()), self.handle_tick)
+        self.handle = self.handle_tick = None
+        self.advance(tick)
+        self.arm()
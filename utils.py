@@ -1,13 +1,39 @@
 import random
-from typing import List, Set, Any, Optional
+from typing import Iterable, Iterator, List, Set, Any, Optional, Tuple, Union
 
+import numpy as np
 from aiogram import types
 
-from constants import bot, on9bot, pool, ADMIN_GROUP_ID, VIP, get_words_all, get_words_set, get_words_li
+from constants import (
+    bot, on9bot, pool, ADMIN_GROUP_ID, VIP, GameSettings, REJECTED_WORDS, PENDING_WORDS, DEFAULT_LANGUAGE,
+    get_words, get_word_sampler
+)
+from words import WordIndex, WordOverlay
 
 
-def check_word_existence(word: str) -> bool:
-    return word in get_words_set()[word[0]]
+def check_word_existence(word: str, language: str = DEFAULT_LANGUAGE, overlay: Optional[WordOverlay] = None) -> bool:
+    index = get_words(language)
+    return overlay.contains(index, word) if overlay else word in index
+
+
+def resolve_words(
+    words: Iterable[str], language: str = DEFAULT_LANGUAGE
+) -> Tuple[List[str], List[Tuple[str, Optional[str]]], List[str], List[str]]:
+    # Split words into existing, rejected (with reason), pending approval and new words
+    # Looks up the word index and the in-memory rejected and pending words only, no database query
+    index = get_words(language)
+    rejected_words = REJECTED_WORDS[language]
+    existing, rejected, pending, new = [], [], [], []
+    for word in words:
+        if word in index:
+            existing.append(word)
+        elif word in rejected_words:
+            rejected.append((word, rejected_words[word]))
+        elif word in PENDING_WORDS[language]:
+            pending.append(word)
+        else:
+            new.append(word)
+    return existing, rejected, pending, new
 
 
 def filter_words(
@@ -15,25 +41,32 @@ def filter_words(
     starting_letter: Optional[str] = None,
     banned_letters: Optional[List[int]] = None,
     required_letter: Optional[str] = None,
-    exclude_words: Optional[Set[str]] = None,
+    exclude_words: Optional[Union[Set[str], "UsedWords"]] = None,
+    language: str = DEFAULT_LANGUAGE,
+    overlay: Optional[WordOverlay] = None,
+    tag: Optional[str] = None,
+    safe_only: bool = False,
 ) -> List[str]:
-    if starting_letter:
-        words = get_words_li()[starting_letter]
-    else:
-        words = get_words_all()
-
-    def f(word):  # Filter
-        if len(word) < min_len:
-            return False
-        if banned_letters and any(i in word for i in banned_letters):
-            return False
-        if required_letter and required_letter not in word:
-            return False
-        if exclude_words and word in exclude_words:
-            return False
-        return True
-
-    return [w for w in words if f(w)]
+    # Words added by an overlay have no tags
+    # Used words are excluded by their bitset before any word is decoded
+    # safe_only leaves out words with blocklisted strings, for words chosen by the bot, see WordIndex.is_safe
+    index = get_words(language)
+    excluded = exclude_words.get_bits() if isinstance(exclude_words, UsedWords) else None
+    words = index.get_words_at(
+        index.filter(min_len, starting_letter, banned_letters, required_letter, tag, excluded, safe_only)
+    )
+    if overlay:
+        words = [w for w in words if w not in overlay.removed]
+        if not tag:
+            added = overlay.get_matching(overlay.added, min_len, starting_letter, banned_letters, required_letter)
+            words += [
+                w for w in added
+                if w not in index and (not exclude_words or w not in exclude_words)
+                and (not safe_only or index.is_safe(w))
+            ]
+    if exclude_words and excluded is None:
+        words = [w for w in words if w not in exclude_words]
+    return words
 
 
 def get_random_word(
@@ -41,15 +74,183 @@ def get_random_word(
     starting_letter: Optional[str] = None,
     banned_letters: Optional[List[int]] = None,
     required_letter: Optional[str] = None,
-    exclude_words: Optional[Set[str]] = None,
+    exclude_words: Optional[Union[Set[str], "UsedWords"]] = None,
+    language: str = DEFAULT_LANGUAGE,
+    weighting: Optional[str] = None,
+    overlay: Optional[WordOverlay] = None,
+    tag: Optional[str] = None,
+    safe_only: bool = False,
 ) -> Optional[str]:
-    words = filter_words(min_len, starting_letter, banned_letters, required_letter, exclude_words)
+    # Rejection sampling, only builds the list of valid words if the constraints reject nearly every draw
+    # With a weighting, words used by players are drawn by usage first, see words.WORD_WEIGHTINGS
+    # Words added by an overlay are only drawn by usage or if the list of valid words is built.
+    index = get_words(language)
+    sampler = get_word_sampler(language)
+    if weighting and sampler:
+        for word in sampler.sample(weighting, min_len, starting_letter, banned_letters, required_letter):
+            if (
+                check_word_existence(word, language, overlay)
+                and (not exclude_words or word not in exclude_words)
+                and (not tag or index.word_has_tag(tag, word))
+                and (not safe_only or index.is_safe(word))
+            ):
+                return word
+
+    excluded = exclude_words.get_bits() if isinstance(exclude_words, UsedWords) else None
+    for o in index.sample(min_len, starting_letter, banned_letters, required_letter, tag, excluded, safe_only):
+        word = index[o]
+        if (
+            (excluded is not None or not exclude_words or word not in exclude_words)
+            and (not overlay or word not in overlay.removed)
+        ):
+            return word
+
+    words = filter_words(
+        min_len, starting_letter, banned_letters, required_letter, exclude_words, language, overlay, tag, safe_only
+    )
     if words:
         return random.choice(words)
     else:
         return None
 
 
+def has_enough_answers(
+    min_len: int = 1,
+    starting_letter: Optional[str] = None,
+    banned_letters: Optional[List[str]] = None,
+    required_letters: Optional[List[str]] = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> bool:
+    # Whether a game position leaves enough valid answers, read from the count tables of the word index
+    return get_words(language).has_at_least(
+        GameSettings.MIN_VALID_ANSWERS, min_len, starting_letter, banned_letters, required_letters
+    )
+
+
+def get_suggestions(
+    word: str,
+    starting_letter: Optional[str] = None,
+    min_len: int = 1,
+    exclude_words: Optional[Union[Set[str], "UsedWords"]] = None,
+    language: str = DEFAULT_LANGUAGE,
+    overlay: Optional[WordOverlay] = None,
+    banned_letters: Optional[List[str]] = None,
+    required_letter: Optional[str] = None,
+) -> str:
+    # "Did you mean" text for a word not in the word list, empty if there are no close words
+    # Only words satisfying the constraints of the turn are suggested.
+    if overlay and overlay.removed:
+        exclude_words = set(exclude_words or ()) | overlay.removed
+    suggestions = get_words(language).suggest(
+        word, 3, starting_letter, min_len, exclude_words, banned_letters, required_letter
+    )
+    if not suggestions:
+        return ""
+    return "\nBunu mu demek istediniz: " + ", ".join(f"_{w.capitalize()}_" for w in suggestions) + "?"
+
+
+class WordPool:
+    # Valid answers of a game under fixed constraints
+    # Used words are swap-removed so that picking a random answer stays O(1) however long the game runs
+    def __init__(self, words: List[str]) -> None:
+        self.words = words
+        self.positions = {w: i for i, w in enumerate(words)}
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.positions
+
+    def remove(self, word: str) -> None:
+        i = self.positions.pop(word, None)
+        if i is None:
+            return
+        last = self.words.pop()
+        if i < len(self.words):  # Move last word into the gap
+            self.words[i] = last
+            self.positions[last] = i
+
+    def get_random_word(self) -> Optional[str]:
+        return random.choice(self.words) if self.words else None
+
+
+class UsedWords:
+    # Words used in a game as a packed bitset over the ordinals of the word index of the game language
+    # Membership is one ordinal lookup and a bit test, and the bitset is passed to WordIndex.filter and
+    # WordIndex.sample so that used words are excluded without decoding or hashing them.
+    # Memory is one bit per word in the index however many words are used.
+    # Words not in the index, e.g. added by group overlays, are kept as strings.
+    # Lemma groups of the used words are kept too, see WordIndex.get_lemma.
+    def __init__(self, language: str = DEFAULT_LANGUAGE) -> None:
+        self.language = language
+        self.index: Optional[WordIndex] = None
+        self.bits = np.zeros(0, dtype=np.uint8)
+        self.others: Set[str] = set()
+        self.lemmas: Set[int] = set()
+        self.count = 0
+        self.version = 0  # Version of the word index the others were last checked against
+
+    def _get_index(self) -> WordIndex:
+        # Ordinals change when the word index is reloaded, so used words are moved over to the new index
+        index = get_words(self.language)
+        if index is self.index and index.version != self.version:
+            # Words may have been added to the index since they were used, move them into the bitset
+            self.version = index.version
+            for word in [w for w in self.others if index.ordinal(w) is not None]:
+                self.others.remove(word)
+                self.count -= 1
+                self.add(word)
+        elif index is not self.index:
+            words = list(self)
+            self.index = index
+            self.version = index.version
+            self.bits = np.zeros((len(index.masks) + len(index.extra_words) + 7) // 8, dtype=np.uint8)
+            self.others = set()
+            self.lemmas = set()
+            self.count = 0
+            for word in words:
+                self.add(word)
+        return index
+
+    def __contains__(self, word: str) -> bool:
+        o = self._get_index().ordinal(word)
+        if o is None:
+            return word in self.others
+        return o >> 3 < len(self.bits) and bool(self.bits[o >> 3] & (0x80 >> (o & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        if self.index is not None:
+            yield from self.index.get_words_at(np.flatnonzero(np.unpackbits(self.bits)))
+        yield from self.others
+
+    def has_lemma_of(self, word: str) -> bool:
+        # Whether a word with the same lemma group as word was used, e.g. "cat" for "cats"
+        index = self._get_index()
+        o = index.ordinal(word)
+        return o is not None and index.get_lemma_at(o) in self.lemmas
+
+    def add(self, word: str) -> None:
+        index = self._get_index()
+        o = index.ordinal(word)
+        if o is None:
+            if word not in self.others:
+                self.others.add(word)
+                self.count += 1
+            return
+        if o >> 3 >= len(self.bits):  # Added to the index after the bitset was allocated
+            self.bits = np.concatenate((self.bits, np.zeros((o >> 3) + 1 - len(self.bits), dtype=np.uint8)))
+        self.lemmas.add(index.get_lemma_at(o))
+        bit = 0x80 >> (o & 7)
+        if not self.bits[o >> 3] & bit:
+            self.bits[o >> 3] |= bit
+            self.count += 1
+
+    def get_bits(self) -> np.ndarray:
+        self._get_index()
+        return self.bits
+
+
 async def send_admin_group(*args: Any, **kwargs: Any) -> types.Message:
     return await bot.send_message(ADMIN_GROUP_ID, *args, disable_web_page_preview=True, **kwargs)
 
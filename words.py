@@ -0,0 +1,1291 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from bisect import bisect_right
+from collections import deque
+from itertools import combinations
+from string import ascii_lowercase
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Any, Set
+
+import numpy as np
+
+# Sections file layout of word snapshots and definitions.py files: header struct (magic, format version,
+# JSON header length), JSON header, then arrays as sections aligned to 8 bytes.
+# The JSON header holds the section layout and the payload checksum besides the fields of each file type.
+SECTIONS_HEADER = struct.Struct("<6sHI")
+# Word snapshots hold the index arrays, the JSON header also holds the language and the source manifest
+SNAPSHOT_MAGIC = b"NWDICT"
+SNAPSHOT_VERSION = 7
+
+# Rejection sampling parameters of WordIndex.sample
+SAMPLING_ROUNDS = 4
+SAMPLES_PER_ROUND = 64
+rng = np.random.default_rng()
+# Weights of WordSampler by the number of times each word was used
+WORD_WEIGHTINGS = {
+    "popular": lambda counts: counts,
+    "rare": lambda counts: 1 / counts,
+}
+
+# Count tables of WordIndex.count_bounds hold the number of words containing each set of
+# at most COUNT_MAX_LETTERS letters, per starting letter and minimum length up to COUNT_MAX_MIN_LEN
+COUNT_MAX_LETTERS = 3
+COUNT_MAX_MIN_LEN = 12
+# Maximum number of keys counted at once while building the count tables
+COUNT_CHUNK_SIZE = 1 << 22
+
+# Suggestions of WordIndex.suggest come from a symmetric delete index over the first SUGGEST_PREFIX_LEN letters:
+# a word is a candidate if deleting up to SUGGEST_MAX_DISTANCE letters from its prefix and from the prefix
+# of the query gives the same string.
+# Each entry is the string packed as a number in base len(alphabet) + 1, shifted left by SUGGEST_ORDINAL_BITS,
+# or the ordinal.
+SUGGEST_PREFIX_LEN = 7
+SUGGEST_MAX_DISTANCE = 2
+SUGGEST_ORDINAL_BITS = 24
+SUGGEST_DELETE_POSITIONS = [
+    c for r in range(SUGGEST_MAX_DISTANCE + 1) for c in combinations(range(SUGGEST_PREFIX_LEN), r)
+]
+
+
+class Alphabet:
+    # Letters of a language in alphabetical order, with the lowercasing and inflection rules of the language
+    # Words are stored with one byte per letter, the i-th letter as ord("a") + i, so byte order is alphabetical.
+
+    def __init__(
+        self,
+        language: str,
+        letters: str,
+        vowels: str,
+        lowercase: Optional[Dict[str, str]] = None,
+        suffixes: Iterable[Tuple[Any, ...]] = (),
+        min_stem_len: int = 2,
+        softening: Optional[Dict[str, str]] = None,
+        invariants: Iterable[str] = (),
+    ) -> None:
+        if len(letters) > 32:  # Letter masks are uint32
+            raise ValueError(f"Too many letters in alphabet: {len(letters)}")
+        self.language = language
+        self.letters = letters
+        self.vowels = vowels
+        self.indexes = {c: i for i, c in enumerate(letters)}
+        self.lowercase = str.maketrans(lowercase or {})  # Applied before str.lower
+        # Inflection rules of get_stems: (suffix, replacement[, minimum stem length]) rules tried in order,
+        # the default minimum length of the stem left by removing the suffix, before the replacement is added,
+        # final consonants softened before suffixes starting with a vowel, stem consonant mapped to the root one,
+        # and words that only look inflected, e.g. "news"
+        self.suffixes = [(rule[0], rule[1], rule[2] if len(rule) > 2 else min_stem_len) for rule in suffixes]
+        self.min_stem_len = min_stem_len
+        self.softening = softening or {}
+        self.invariants = frozenset(invariants)
+        codes = "".join(chr(ord("a") + i) for i in range(len(letters)))
+        self.is_ascii = letters == codes  # Stored as is
+        self.encoding = str.maketrans(letters, codes)
+        self.decoding = str.maketrans(codes, letters)
+
+        # Letter sets of the count tables as sorted letter indexes padded with len(letters), and their ids
+        letter_sets = [
+            c + (len(letters),) * (COUNT_MAX_LETTERS - r)
+            for r in range(COUNT_MAX_LETTERS + 1) for c in combinations(range(len(letters)), r)
+        ]
+        self.letter_set_count = len(letter_sets)
+        self.letter_set_ids = np.zeros((len(letters) + 1,) * COUNT_MAX_LETTERS, dtype=np.int64)
+        self.letter_set_ids[tuple(np.array(letter_sets).T)] = np.arange(len(letter_sets))
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def normalize(self, text: str) -> str:
+        return text.translate(self.lowercase).lower()
+
+    def is_word(self, word: str) -> bool:
+        return bool(word) and all(c in self.indexes for c in word)
+
+    def encode(self, word: str) -> bytes:
+        # Word must consist of letters of the alphabet only
+        return word.encode() if self.is_ascii else word.translate(self.encoding).encode()
+
+    def decode(self, data: bytes) -> str:
+        return data.decode() if self.is_ascii else data.decode().translate(self.decoding)
+
+    def get_mask(self, letters: Iterable[str]) -> int:
+        # Bit i is set if the i-th letter is in letters, same layout as WordIndex.masks
+        mask = 0
+        for c in letters:
+            mask |= 1 << self.indexes[c]
+        return mask
+
+    def get_letter_set_id(self, letters: Iterable[str]) -> int:
+        # Id of a set of at most COUNT_MAX_LETTERS letters in the count tables
+        indexes = sorted(self.indexes[c] for c in set(letters))
+        return int(self.letter_set_ids[tuple(indexes + [len(self)] * (COUNT_MAX_LETTERS - len(indexes)))])
+
+    def get_delete_keys(self, word: str) -> List[int]:
+        # Keys of the strings obtained by deleting up to SUGGEST_MAX_DISTANCE letters from the prefix of word
+        prefix = [self.indexes[c] + 1 for c in word[:SUGGEST_PREFIX_LEN]]
+        base = len(self) + 1
+        keys = set()
+        for positions in SUGGEST_DELETE_POSITIONS:
+            if positions and positions[-1] >= len(prefix):
+                continue
+            kept = [x for i, x in enumerate(prefix) if i not in positions]
+            keys.add(sum(x * base ** (SUGGEST_PREFIX_LEN - 1 - i) for i, x in enumerate(kept)))
+        return sorted(keys)
+
+    def get_stems(self, word: str) -> Iterator[str]:
+        # Possible shorter forms of word by the inflection rules, most likely first, which may not be words
+        if word in self.invariants:
+            return
+        for suffix, replacement, min_stem_len in self.suffixes:
+            stem = word[:-len(suffix)]
+            if not word.endswith(suffix) or len(stem) < min_stem_len:
+                continue
+            yield stem + replacement
+            if not replacement:
+                last = stem[-1]
+                if len(stem) > min_stem_len and stem[-2] == last and last not in self.vowels:
+                    yield stem[:-1]  # Doubled final consonant, e.g. "cat" in "catting"
+                if last in self.softening and suffix[0] in self.vowels:
+                    yield stem[:-1] + self.softening[last]
+
+
+# Inflectional suffixes only, derivational ones such as -ness or the agent noun -er form distinct words
+# Stems of at least 3 letters, so that e.g. "thing" is not "the" + "ing", except "fly" in "flies".
+# Comparative -er and -est are left out too since most words ending in them are not comparatives, e.g. "letter".
+EN_SUFFIXES = [
+    ("ies", "y", 2), ("ied", "y", 2), ("ing", ""), ("ing", "e"), ("es", ""), ("ed", ""), ("ed", "e"), ("s", ""),
+]
+# Words ending in a suffix that are not inflections of the word without it, after the Snowball English stemmer
+EN_INVARIANTS = """
+    news evening morning ceiling pudding wedding inning outing canning herring earring proceed exceed succeed
+    bias atlas cosmos species series
+""".split()
+# Plural, possessive and case suffixes, longer ones first
+# Bare vowel suffixes are left out since they would strip the final vowel of most words, e.g. "kapı".
+TR_SUFFIXES = [
+    (suffix, "") for suffix in (
+        "ları leri lar ler nın nin nun nün dan den tan ten ndan nden sı si su sü yı yi yu yü ya ye ın in un ün "
+        "da de ta te"
+    ).split()
+]
+
+ALPHABETS = {
+    "en": Alphabet("en", ascii_lowercase, "aeiou", suffixes=EN_SUFFIXES, min_stem_len=3, invariants=EN_INVARIANTS),
+    "tr": Alphabet(
+        "tr", "abcçdefgğhıijklmnoöprsştuüvyz", "aeıioöuü", {"I": "ı", "İ": "i"},
+        suffixes=TR_SUFFIXES, softening={"b": "p", "c": "ç", "d": "t", "ğ": "k"},
+    ),
+}
+
+
+def align(n: int) -> int:
+    return -(-n // 8) * 8
+
+
+def save_sections(
+    path: str, magic: bytes, version: int, sections: Dict[str, np.ndarray], header: Dict[str, Any]
+) -> None:
+    # Write arrays as a sections file, header holds the fields of the file type
+    layout = {}
+    payload = []
+    checksum = hashlib.sha256()
+    offset = 0
+    for name, array in sections.items():
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": array.shape}
+        data = array.tobytes()
+        data += bytes(align(len(data)) - len(data))
+        payload.append(data)
+        checksum.update(data)
+        offset += len(data)
+    header = json.dumps({"sections": layout, "checksum": checksum.hexdigest(), **header}).encode()
+
+    # Write to a temporary file then rename so that readers never see a partial file,
+    # the file name is unique so that concurrent writers of the same path do not write into each other's file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with open(fd, "wb") as f:
+            f.write(SECTIONS_HEADER.pack(magic, version, len(header)))
+            f.write(header)
+            f.write(bytes(align(f.tell()) - f.tell()))
+            for data in payload:
+                f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable only by the owner
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_sections(
+    path: str, magic: bytes, version: int, name: str, verify: bool = True
+) -> Tuple[mmap.mmap, Dict[str, Any], Dict[str, np.ndarray], int]:
+    # Memory-map a sections file read-only, returns the map, the JSON header, the arrays and the payload start
+    # Raises ValueError if the file is of another type, format version or language, or corrupted if verify is set,
+    # name is the file type in error messages
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The map is closed if the file is rejected so that repeated failed loads do not leak maps
+    try:
+        if len(mm) < SECTIONS_HEADER.size:
+            raise ValueError(f"Truncated {name}")
+        file_magic, file_version, header_len = SECTIONS_HEADER.unpack_from(mm)
+        if file_magic != magic or file_version != version:
+            raise ValueError(f"Unsupported {name} format {file_magic!r} v{file_version}")
+        header = json.loads(mm[SECTIONS_HEADER.size:SECTIONS_HEADER.size + header_len])
+        if header["language"] not in ALPHABETS:
+            raise ValueError(f"Unsupported {name} language {header['language']}")
+        payload_start = align(SECTIONS_HEADER.size + header_len)
+        if verify:
+            with memoryview(mm) as view:
+                if hashlib.sha256(view[payload_start:]).hexdigest() != header["checksum"]:
+                    raise ValueError(f"{name.capitalize()} checksum mismatch")
+
+        arrays = {
+            section_name: np.frombuffer(
+                mm,
+                dtype=section["dtype"],
+                count=int(np.prod(section["shape"])),
+                offset=payload_start + section["offset"],
+            ).reshape(section["shape"])
+            for section_name, section in header["sections"].items()
+        }
+    except BaseException:
+        mm.close()
+        raise
+    return mm, header, arrays, payload_start
+
+
+def build_snapshot(
+    words_path: str,
+    snapshot_path: str,
+    removed_path: Optional[str],
+    manifest: Dict[str, Any],
+    language: str,
+    blocklist_path: Optional[str] = None,
+) -> int:
+    # Builds an index from a file with one normalized word per line, excluding the words in removed_path,
+    # and saves it as a snapshot, returns the word count
+    # Words containing a line of blocklist_path are marked unsafe, see WordIndex.is_safe
+    # Run as a separate process (see the end of this file) to keep the CPU work off the event loop
+    alphabet = ALPHABETS[language]
+    with open(words_path, encoding="utf-8") as f:
+        words = set(f.read().split())
+    if removed_path:
+        with open(removed_path, encoding="utf-8") as f:
+            words.difference_update(f.read().split())
+    blocklist = []
+    if blocklist_path:
+        with open(blocklist_path, encoding="utf-8") as f:
+            blocklist = [alphabet.normalize(line.strip()) for line in f]
+    index = WordIndex.build(words, alphabet, blocklist)
+    index.save(snapshot_path, {**manifest, "word_count": len(index)})
+    return len(index)
+
+
+def pack_words(words: List[bytes]) -> Tuple[bytes, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Buffer of encoded words and their lengths, start positions in the buffer, letter indexes and letter masks
+    buffer = b"".join(words)
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    word_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    letters = np.frombuffer(buffer, dtype=np.uint8) - ord("a")
+    # OR together the bit of every letter in the buffer, one reduction per word
+    if words:
+        masks = np.bitwise_or.reduceat(np.left_shift(np.uint32(1), letters, dtype=np.uint32), word_starts)
+    else:
+        masks = np.empty(0, dtype=np.uint32)
+    return buffer, lengths, word_starts, letters, masks
+
+
+def build_counts(masks: np.ndarray, first_letters: np.ndarray, lengths: np.ndarray, alphabet: Alphabet) -> np.ndarray:
+    # counts[l, n - 1, s] is the number of words starting with the l-th letter with at least n letters
+    # containing all letters of set s, row len(alphabet) is for any starting letter
+    # Every word adds one to each subset of its distinct letters of at most COUNT_MAX_LETTERS letters.
+    # Words are grouped by their number of distinct letters so that all subsets are enumerated at once.
+    n_sets = alphabet.letter_set_count
+    groups = first_letters * COUNT_MAX_MIN_LEN + np.minimum(lengths, COUNT_MAX_MIN_LEN) - 1
+    bits = (masks[:, None] >> np.arange(len(alphabet), dtype=np.uint32)) & 1
+    distinct_counts = bits.sum(axis=1)
+    # Distinct letters of each word in ascending order followed by padding
+    letters = np.sort(np.where(bits, np.arange(len(alphabet)), len(alphabet)), axis=1)
+    letters = np.concatenate((letters, np.full((len(masks), 1), len(alphabet))), axis=1)
+
+    counts = np.zeros(len(alphabet) * COUNT_MAX_MIN_LEN * n_sets, dtype=np.int64)
+    for k in np.unique(distinct_counts).tolist():
+        # Columns of each subset, padded with column k which always holds padding
+        columns = np.array([
+            c + (k,) * (COUNT_MAX_LETTERS - r)
+            for r in range(min(k, COUNT_MAX_LETTERS) + 1) for c in combinations(range(k), r)
+        ]).T
+        selected = np.flatnonzero(distinct_counts == k)
+        step = max(COUNT_CHUNK_SIZE // columns.shape[1], 1)
+        for i in range(0, len(selected), step):
+            chunk = selected[i:i + step]
+            word_letters = letters[chunk]
+            ids = alphabet.letter_set_ids[tuple(word_letters[:, c] for c in columns)]
+            counts += np.bincount((groups[chunk, None] * n_sets + ids).ravel(), minlength=len(counts))
+
+    counts = counts.reshape(len(alphabet), COUNT_MAX_MIN_LEN, n_sets)
+    counts = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1]  # Words with at least n letters
+    return np.concatenate((counts, counts.sum(axis=0, keepdims=True))).astype(np.int32)
+
+
+def build_deletes(letters: np.ndarray, word_starts: np.ndarray, lengths: np.ndarray, alphabet: Alphabet) -> np.ndarray:
+    # Sorted entries of the delete index, see SUGGEST_PREFIX_LEN
+    if len(lengths) >= 1 << SUGGEST_ORDINAL_BITS:
+        raise ValueError(f"Too many words for the delete index: {len(lengths)}")
+    # Prefixes as letter numbers from 1, padded with 0
+    prefixes = np.zeros((len(lengths), SUGGEST_PREFIX_LEN), dtype=np.int64)
+    for i in range(SUGGEST_PREFIX_LEN):
+        has_letter = lengths > i
+        prefixes[has_letter, i] = letters[word_starts[has_letter] + i] + 1
+    powers = (len(alphabet) + 1) ** np.arange(SUGGEST_PREFIX_LEN - 1, -1, -1, dtype=np.int64)
+    ordinals = np.arange(len(lengths), dtype=np.int64)
+
+    parts = []
+    for positions in SUGGEST_DELETE_POSITIONS:
+        # Deleting padding is skipped, the other deletions of the same word yield it
+        valid = lengths > max(positions, default=-1)
+        kept = [i for i in range(SUGGEST_PREFIX_LEN) if i not in positions]
+        keys = prefixes[valid][:, kept] @ powers[:len(kept)]
+        parts.append((keys << SUGGEST_ORDINAL_BITS) | ordinals[valid])
+    entries = np.concatenate(parts).astype(np.uint64)
+    if entries.size == 0:
+        return entries
+    entries.sort()
+    return entries[np.concatenate(([True], entries[1:] != entries[:-1]))]
+
+
+def test_bits(bits: np.ndarray, ordinals: np.ndarray) -> np.ndarray:
+    # Whether the bit of each ordinal is set in a packed bitset, ordinals past the end of the bitset are not set
+    in_range = ordinals < len(bits) * 8
+    ordinals = np.where(in_range, ordinals, 0)
+    return in_range & (((bits[ordinals >> 3] >> (7 - (ordinals & 7))) & 1) == 1)
+
+
+def build_blocklist(patterns: Iterable[str], alphabet: Alphabet) -> Tuple[np.ndarray, np.ndarray]:
+    # Aho-Corasick automaton of the blocked substrings as a complete transition table
+    # transitions[s, l] is the state after reading the l-th letter in state s, state 0 is the root.
+    # blocked[s] is set if a blocked substring ends at state s, including by failure links.
+    children: List[Dict[int, int]] = [{}]
+    blocked = [False]
+    for pattern in patterns:
+        s = 0
+        for c in pattern:
+            letter = alphabet.indexes[c]
+            if letter not in children[s]:
+                children[s][letter] = len(children)
+                children.append({})
+                blocked.append(False)
+            s = children[s][letter]
+        blocked[s] = True
+
+    transitions = np.zeros((len(children), len(alphabet)), dtype=np.int32)
+    failures = [0] * len(children)
+    # Breadth first so that the row of the failure state is complete before the states that fall back to it
+    queue = deque(children[0].values())
+    transitions[0, list(children[0])] = list(children[0].values())
+    while queue:
+        s = queue.popleft()
+        blocked[s] = blocked[s] or blocked[failures[s]]
+        transitions[s] = transitions[failures[s]]
+        for letter, child in children[s].items():
+            failures[child] = int(transitions[failures[s], letter])
+            transitions[s, letter] = child
+            queue.append(child)
+    return transitions, np.array(blocked, dtype=bool)
+
+
+def build_unsafe(
+    letters: np.ndarray, word_starts: np.ndarray, lengths: np.ndarray, transitions: np.ndarray, blocked: np.ndarray
+) -> np.ndarray:
+    # Packed bitset over ordinals of the words containing a blocked substring, see build_blocklist
+    # All words advance through the automaton together, one letter position at a time.
+    unsafe = np.zeros(len(lengths), dtype=bool)
+    if blocked.any() and len(lengths):
+        states = np.zeros(len(lengths), dtype=np.int32)
+        for i in range(int(lengths.max())):
+            active = np.flatnonzero(lengths > i)
+            states[active] = transitions[states[active], letters[word_starts[active] + i]]
+            unsafe[active] |= blocked[states[active]]
+    return np.packbits(unsafe)
+
+
+def build_lemmas(words: List[str], alphabet: Alphabet) -> np.ndarray:
+    # Lemma group of each word in ordinal order, the ordinal of the shortest word it inflects by Alphabet.get_stems
+    # Stems are shorter words with the same starting letter so they come first and already have their group.
+    ordinals = {w: i for i, w in enumerate(words)}
+    lemmas = list(range(len(words)))
+    for i, word in enumerate(words):
+        for stem in alphabet.get_stems(word):
+            o = ordinals.get(stem)
+            if o is not None:
+                lemmas[i] = lemmas[o]
+                break
+    return np.array(lemmas, dtype=np.int32)
+
+
+def get_edit_distance(a: str, b: str, max_distance: int) -> int:
+    # Optimal string alignment distance (adjacent transpositions count as one edit),
+    # any distance above max_distance is returned as max_distance + 1
+    # Only cells within max_distance of the diagonal can be within max_distance, the others are capped.
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    cap = max_distance + 1
+    before = None
+    previous = [min(j, cap) for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        row = [cap] * (len(b) + 1)
+        if i <= max_distance:
+            row[0] = i
+        lo, hi = max(1, i - max_distance), min(len(b), i + max_distance)
+        for j in range(lo, hi + 1):
+            d = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d = min(d, before[j - 2] + 1)
+            row[j] = min(d, cap)
+        if min(row[lo - 1:hi + 1]) > max_distance:
+            return cap
+        before, previous = previous, row
+    return previous[-1]
+
+
+class WordIndex:
+    # Compact dictionary without per-word Python objects
+    # Words are packed into one buffer sorted by starting letter, then length, then alphabetically.
+    # Words with the same starting letter and length form a block of fixed width records,
+    # so a word is found by binary search within its block.
+    # The ordinal of a word is its position in this order.
+    # Words added after the build get the ordinals after the built words, removed words are marked as removed,
+    # so that ordinals never change during the lifetime of an index.
+
+    def __init__(
+        self,
+        buffer: bytes,
+        offsets: np.ndarray,
+        masks: np.ndarray,
+        counts: np.ndarray,
+        deletes: np.ndarray,
+        lemmas: np.ndarray,
+        unsafe: np.ndarray,
+        blocklist_transitions: np.ndarray,
+        blocklist_blocked: np.ndarray,
+        alphabet: Alphabet,
+        buffer_start: int = 0,
+    ) -> None:
+        # buffer may be a memory-mapped snapshot with the packed words starting at buffer_start
+        self.alphabet = alphabet
+        self.buffer = buffer
+        self.buffer_start = buffer_start
+        # offsets[l, n] is the ordinal of the first word starting with the l-th letter with at least n letters
+        # offsets[l, -1] is the end of the letter
+        self.offsets = offsets
+        self.masks = masks  # Letter presence bitmask of each word, see Alphabet.get_mask
+        self.counts = counts  # Count tables of the built words, see build_counts
+        self.deletes = deletes  # Delete index of the built words, see build_deletes
+        self.lemmas = lemmas  # Lemma group of each built word, see build_lemmas
+        # Blocklist automaton and the words the bot must not choose, see build_blocklist and build_unsafe
+        self.blocklist_transitions = blocklist_transitions
+        self.blocklist_blocked = blocklist_blocked
+        self.built_unsafe = unsafe
+        self.unsafe = unsafe  # Including added words
+        self.max_len = offsets.shape[1] - 2
+
+        # Block l * (max_len + 1) + n holds the words with n letters starting with the l-th letter
+        counts = np.diff(offsets, axis=1).ravel()
+        lengths = np.tile(np.arange(self.max_len + 1), len(alphabet))
+        self.block_starts: List[int] = offsets[:, :-1].ravel().tolist() + [len(masks)]
+        self.block_byte_starts: List[int] = (
+            buffer_start + np.concatenate(([0], np.cumsum(counts * lengths)))
+        ).tolist()
+
+        # Incremental changes since the build, see add_words and remove_words
+        self.extra_words: List[str] = []
+        self.extra_ordinals: Dict[str, int] = {}
+        # Letter masks, lengths and starting letter indexes of the added words, so that queries test them vectorized
+        self.extra_masks = np.empty(0, dtype=np.uint32)
+        self.extra_lengths = np.empty(0, dtype=np.int64)
+        self.extra_first_letters = np.empty(0, dtype=np.int64)
+        self.extra_lemmas: List[int] = []
+        self.removed: Set[int] = set()  # Ordinals of removed words
+        self.version = 0  # Incremented on every change
+        # Built words removed and whether each added word is not removed, as of removed_version, see _get_removed
+        self.removed_built = np.empty(0, dtype=np.int64)
+        self.extra_kept = np.empty(0, dtype=bool)
+        self.removed_version = 0
+        self.tags: Dict[str, np.ndarray] = {}  # Packed bitsets over ordinals of the words with each tag, see set_tag
+
+    @classmethod
+    def build(cls, words: Iterable[str], alphabet: Alphabet, blocklist: Iterable[str] = ()) -> "WordIndex":
+        # Words must be unique, non-empty and consist of letters of the alphabet only
+        # Words containing any of the blocklist strings are unsafe for the bot to say, see is_safe
+        words = sorted(map(alphabet.encode, words), key=lambda w: (w[0], len(w), w))
+        buffer, lengths, word_starts, letters, masks = pack_words(words)
+
+        max_len = int(lengths.max()) if words else 0
+        first_letters = letters[word_starts].astype(np.int64) if words else np.empty(0, dtype=np.int64)
+        counts = np.bincount(
+            first_letters * (max_len + 1) + lengths, minlength=len(alphabet) * (max_len + 1)
+        ).reshape(len(alphabet), max_len + 1)
+        offsets = np.zeros((len(alphabet), max_len + 2), dtype=np.int64)
+        offsets[:, 1:] = np.cumsum(counts, axis=1)
+        offsets += np.concatenate(([0], np.cumsum(counts.sum(axis=1))[:-1]))[:, None]
+
+        blocklist_automaton = build_blocklist([p for p in blocklist if alphabet.is_word(p)], alphabet)
+        return cls(
+            buffer,
+            offsets,
+            masks,
+            build_counts(masks, first_letters, lengths, alphabet),
+            build_deletes(letters, word_starts, lengths, alphabet),
+            build_lemmas([alphabet.decode(w) for w in words], alphabet),
+            build_unsafe(letters, word_starts, lengths, *blocklist_automaton),
+            *blocklist_automaton,
+            alphabet,
+        )
+
+    def get_sections(self) -> Dict[str, np.ndarray]:
+        # Arrays stored in snapshots, keyed by __init__ argument name
+        # Snapshots only hold the built words, incremental changes are not included
+        buffer = self.buffer[self.buffer_start:self.block_byte_starts[-1]]
+        return {
+            "buffer": np.frombuffer(buffer, dtype=np.uint8),
+            "offsets": self.offsets,
+            "masks": self.masks,
+            "counts": self.counts,
+            "deletes": self.deletes,
+            "lemmas": self.lemmas,
+            "unsafe": self.built_unsafe,
+            "blocklist_transitions": self.blocklist_transitions,
+            "blocklist_blocked": self.blocklist_blocked,
+        }
+
+    def save(self, path: str, manifest: Dict[str, Any]) -> None:
+        save_sections(
+            path, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.get_sections(),
+            {"language": self.alphabet.language, "manifest": manifest},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["WordIndex", Dict[str, Any]]:
+        # Memory-map a snapshot read-only, returns the index and its source manifest
+        # Raises ValueError if the snapshot is of another format version or corrupted
+        mm, header, arrays, payload_start = load_sections(path, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, "word snapshot")
+        del arrays["buffer"]  # Words are read from the map at buffer_start
+        buffer_start = payload_start + header["sections"]["buffer"]["offset"]
+        return cls(mm, alphabet=ALPHABETS[header["language"]], buffer_start=buffer_start, **arrays), header["manifest"]
+
+    def __len__(self) -> int:
+        return len(self.masks) + len(self.extra_words) - len(self.removed)
+
+    def __contains__(self, word: str) -> bool:
+        return self.ordinal(word) is not None
+
+    def __getitem__(self, ordinal: int) -> str:
+        if ordinal >= len(self.masks):
+            return self.extra_words[ordinal - len(self.masks)]
+        block = bisect_right(self.block_starts, ordinal) - 1
+        n = block % (self.max_len + 1)
+        pos = self.block_byte_starts[block] + (ordinal - self.block_starts[block]) * n
+        return self.alphabet.decode(self.buffer[pos:pos + n])
+
+    def _get_block(self, letter: str, n: int) -> Optional[int]:
+        if letter not in self.alphabet.indexes or not 0 < n <= self.max_len:
+            return None
+        return self.alphabet.indexes[letter] * (self.max_len + 1) + n
+
+    def _bisect(self, block: int, key: bytes, right: bool = False) -> int:
+        # Position in block of the first record whose first len(key) letters are >= key (> key if right)
+        n = block % (self.max_len + 1)
+        byte_start = self.block_byte_starts[block]
+        lo, hi = 0, self.block_starts[block + 1] - self.block_starts[block]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = byte_start + mid * n
+            record = self.buffer[pos:pos + len(key)]
+            if record < key or right and record == key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, word: str) -> Optional[int]:
+        # Ordinal of word including removed words
+        if word in self.extra_ordinals:
+            return self.extra_ordinals[word]
+        block = self._get_block(word[:1], len(word))
+        if block is None or not self.alphabet.is_word(word):
+            return None
+        key = self.alphabet.encode(word)
+        i = self._bisect(block, key)
+        if i == self.block_starts[block + 1] - self.block_starts[block]:
+            return None  # Past the block, the bytes there belong to the next block
+        pos = self.block_byte_starts[block] + i * len(word)
+        if self.buffer[pos:pos + len(word)] != key:
+            return None
+        return self.block_starts[block] + i
+
+    def ordinal(self, word: str) -> Optional[int]:
+        o = self._find(word)
+        return None if o in self.removed else o
+
+    def add_words(self, words: Iterable[str]) -> List[str]:
+        # Words must consist of letters of the alphabet only, returns the words that were not in the index
+        # The arrays of added words are extended once per call, so callers adding many words should pass them
+        # in batches rather than one at a time
+        added = []
+        new_words = []
+        for word in words:
+            o = self._find(word)
+            if o is None:
+                self.extra_ordinals[word] = len(self.masks) + len(self.extra_words)
+                self.extra_lemmas.append(self._find_lemma(word, self.extra_ordinals[word]))
+                self.extra_words.append(word)
+                new_words.append(word)
+            elif o in self.removed:
+                self.removed.remove(o)
+            else:
+                continue
+            added.append(word)
+        if new_words:
+            _, lengths, word_starts, letters, masks = pack_words([self.alphabet.encode(w) for w in new_words])
+            self.extra_masks = np.concatenate((self.extra_masks, masks))
+            self.extra_lengths = np.concatenate((self.extra_lengths, lengths))
+            self.extra_first_letters = np.concatenate((self.extra_first_letters, letters[word_starts]))
+            unsafe = build_unsafe(letters, word_starts, lengths, self.blocklist_transitions, self.blocklist_blocked)
+            unsafe_ordinals = np.flatnonzero(np.unpackbits(unsafe, count=len(new_words)))
+            if len(unsafe_ordinals):
+                unsafe_ordinals += len(self.masks) + len(self.extra_words) - len(new_words)
+                size = (len(self.masks) + len(self.extra_words) + 7) // 8
+                self.unsafe = np.concatenate((self.unsafe, np.zeros(size - len(self.unsafe), dtype=np.uint8)))
+                np.bitwise_or.at(self.unsafe, unsafe_ordinals >> 3, (0x80 >> (unsafe_ordinals & 7)).astype(np.uint8))
+        if added:
+            self.version += 1
+        return added
+
+    def _find_lemma(self, word: str, o: int) -> int:
+        # Lemma group of a word added after the build, same rules as build_lemmas
+        for stem in self.alphabet.get_stems(word):
+            stem_o = self._find(stem)
+            if stem_o is not None:
+                return self.get_lemma_at(stem_o)
+        return o
+
+    def get_lemma_at(self, o: int) -> int:
+        return int(self.lemmas[o]) if o < len(self.masks) else self.extra_lemmas[o - len(self.masks)]
+
+    def _is_blocked(self, word: str) -> bool:
+        s = 0
+        for c in word:
+            s = self.blocklist_transitions[s, self.alphabet.indexes[c]]
+            if self.blocklist_blocked[s]:
+                return True
+        return False
+
+    def is_safe(self, word: str) -> bool:
+        # Whether word contains none of the blocklist strings, also for words not in the index
+        o = self.ordinal(word)
+        if o is None:
+            return not self.alphabet.is_word(word) or not self._is_blocked(word)
+        return not test_bits(self.unsafe, np.array([o]))[0]
+
+    def get_lemma(self, word: str) -> Optional[int]:
+        # Lemma group of a word, equal for a word and its inflections, e.g. "cat", "cats" and "catting"
+        o = self.ordinal(word)
+        return None if o is None else self.get_lemma_at(o)
+
+    def remove_words(self, words: Iterable[str]) -> List[str]:
+        # Returns the words that were in the index
+        removed = []
+        for word in words:
+            o = self.ordinal(word)
+            if o is not None:
+                self.removed.add(o)
+                removed.append(word)
+        if removed:
+            self.version += 1
+        return removed
+
+    def get_masks(self, ordinals: np.ndarray) -> np.ndarray:
+        if not self.extra_words:
+            return self.masks[ordinals]
+        is_extra = ordinals >= len(self.masks)
+        masks = np.empty(len(ordinals), dtype=np.uint32)
+        masks[~is_extra] = self.masks[ordinals[~is_extra]]
+        masks[is_extra] = self.extra_masks[ordinals[is_extra] - len(self.masks)]
+        return masks
+
+    def _get_removed(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Sorted ordinals of the removed built words and whether each added word is not removed
+        if self.removed_version != self.version:
+            removed = np.fromiter(self.removed, dtype=np.int64, count=len(self.removed))
+            removed.sort()
+            self.removed_built = removed[removed < len(self.masks)]
+            self.extra_kept = np.ones(len(self.extra_words), dtype=bool)
+            self.extra_kept[removed[removed >= len(self.masks)] - len(self.masks)] = False
+            self.removed_version = self.version
+        return self.removed_built, self.extra_kept
+
+    def _match_extra(
+        self, min_len: int, starting_letter: Optional[str], banned_mask: int, required_mask: int
+    ) -> np.ndarray:
+        # Whether each added word satisfies the constraints, including removed ones
+        masks = self.extra_masks
+        valid = ((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)
+        valid &= self.extra_lengths >= min_len
+        if starting_letter:
+            valid &= self.extra_first_letters == self.alphabet.indexes[starting_letter]
+        return valid
+
+    def get_words(self, start: int, end: int) -> List[str]:
+        # Built words with ordinals in [start, end) including removed words
+        words = []
+        block = bisect_right(self.block_starts, start) - 1
+        while start < end:
+            n = block % (self.max_len + 1)
+            block_end = min(self.block_starts[block + 1], end)
+            if block_end > start:
+                pos = self.block_byte_starts[block] + (start - self.block_starts[block]) * n
+                chunk = self.alphabet.decode(self.buffer[pos:pos + (block_end - start) * n])
+                words += [chunk[i:i + n] for i in range(0, len(chunk), n)]
+                start = block_end
+            block += 1
+        return words
+
+    def get_words_at(self, ordinals: np.ndarray) -> List[str]:
+        # Words with the given ordinals in the same order
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        blocks = np.searchsorted(self.block_starts, ordinals, side="right") - 1
+        lengths = (blocks % (self.max_len + 1)).tolist()
+        block_starts = np.asarray(self.block_starts)[blocks]
+        positions = (np.asarray(self.block_byte_starts)[blocks] + (ordinals - block_starts) * lengths).tolist()
+        return [
+            self.alphabet.decode(self.buffer[pos:pos + n]) if o < len(self.masks)
+            else self.extra_words[o - len(self.masks)]
+            for o, pos, n in zip(ordinals.tolist(), positions, lengths)
+        ]
+
+    def iter_letter(self, letter: str) -> Iterator[str]:
+        # Words starting with letter, one block at a time
+        for n in range(1, self.max_len + 1):
+            block = self._get_block(letter, n)
+            ordinals = np.arange(self.block_starts[block], self.block_starts[block + 1])
+            yield from self.get_words_at(self._without_removed(ordinals))
+        if self.extra_words:
+            _, extra_kept = self._get_removed()
+            valid = extra_kept & (self.extra_first_letters == self.alphabet.indexes[letter])
+            yield from (self.extra_words[i] for i in np.flatnonzero(valid).tolist())
+
+    def _without_removed(self, ordinals: np.ndarray) -> np.ndarray:
+        if not self.removed:
+            return ordinals
+        return ordinals[~np.isin(ordinals, np.fromiter(self.removed, dtype=np.int64, count=len(self.removed)))]
+
+    def get_ranges(self, min_len: int = 1, starting_letter: Optional[str] = None) -> List[Tuple[int, int]]:
+        # Ordinal ranges covering the built words with at least min_len letters
+        # One range if starting letter is given, else one per letter
+        n = min(max(min_len, 0), self.max_len + 1)
+        if starting_letter:
+            l = self.alphabet.indexes[starting_letter]
+            return [(int(self.offsets[l, n]), int(self.offsets[l, -1]))]
+        return list(zip(self.offsets[:, n].tolist(), self.offsets[:, -1].tolist()))
+
+    def get_prefix_ordinals(self, prefix: str) -> np.ndarray:
+        # Ordinals of words starting with prefix, ordered by length then alphabetically for built words
+        if not self.alphabet.is_word(prefix):
+            return np.empty(0, dtype=np.int64)
+        key = self.alphabet.encode(prefix)
+        parts = []
+        for n in range(len(prefix), self.max_len + 1):
+            block = self._get_block(prefix[0], n)
+            if block is None:
+                break
+            start = self.block_starts[block]
+            parts.append(np.arange(start + self._bisect(block, key), start + self._bisect(block, key, right=True)))
+        if self.extra_words:
+            candidates = np.flatnonzero(self._match_extra(len(prefix), prefix[0], 0, 0)).tolist()
+            parts.append(np.array(
+                [len(self.masks) + i for i in candidates if self.extra_words[i].startswith(prefix)], dtype=np.int64
+            ))
+        if not parts:  # Prefix longer than every word
+            return np.empty(0, dtype=np.int64)
+        return self._without_removed(np.concatenate(parts))
+
+    def _satisfies(self, word: str, min_len: int, starting_letter: Optional[str]) -> bool:
+        return len(word) >= min_len and (not starting_letter or word[0] == starting_letter)
+
+    def filter(
+        self,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letter: Optional[str] = None,
+        tag: Optional[str] = None,
+        excluded: Optional[np.ndarray] = None,
+        safe_only: bool = False,
+    ) -> np.ndarray:
+        # Ordinals of words satisfying the constraints
+        # excluded is a packed bitset over ordinals of words to leave out, see utils.UsedWords
+        # safe_only leaves out the words unsafe for the bot to say, see is_safe
+        banned_mask = self.alphabet.get_mask(banned_letters or "")
+        required_mask = self.alphabet.get_mask(required_letter or "")
+        parts = []
+        for start, end in self.get_ranges(min_len, starting_letter):
+            masks = self.masks[start:end]
+            valid = ((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)
+            parts.append(np.flatnonzero(valid) + start)
+        if self.extra_words:
+            valid = self._match_extra(min_len, starting_letter, banned_mask, required_mask)
+            parts.append(np.flatnonzero(valid) + len(self.masks))
+        ordinals = self._without_removed(np.concatenate(parts))
+        if tag:
+            ordinals = ordinals[self.has_tag(tag, ordinals)]
+        if excluded is not None:
+            ordinals = ordinals[~test_bits(excluded, ordinals)]
+        if safe_only:
+            ordinals = ordinals[~test_bits(self.unsafe, ordinals)]
+        return ordinals
+
+    def set_tag(self, tag: str, words: Iterable[str]) -> None:
+        # Words not in the index are skipped, and words added to the index afterwards do not have the tag
+        bits = np.zeros(len(self.masks) + len(self.extra_words), dtype=bool)
+        bits[[o for o in map(self.ordinal, words) if o is not None]] = True
+        self.tags[tag] = np.packbits(bits)
+
+    def word_has_tag(self, tag: str, word: str) -> bool:
+        bits = self.tags[tag]
+        o = self.ordinal(word)
+        return o is not None and o < len(bits) * 8 and bool(bits[o >> 3] >> (7 - (o & 7)) & 1)
+
+    def has_tag(self, tag: str, ordinals: np.ndarray) -> np.ndarray:
+        return test_bits(self.tags[tag], ordinals)
+
+    def _count_changes(
+        self, min_len: int, starting_letter: Optional[str], banned: Set[str], required: Set[str]
+    ) -> int:
+        # Change in the number of words satisfying the constraints since the build
+        if not self.extra_words and not self.removed:
+            return 0
+        banned_mask = self.alphabet.get_mask(banned)
+        required_mask = self.alphabet.get_mask(required)
+        removed_built, extra_kept = self._get_removed()
+        added = self._match_extra(min_len, starting_letter, banned_mask, required_mask) & extra_kept
+        masks = self.masks[removed_built]
+        blocks = np.searchsorted(self.block_starts, removed_built, side="right") - 1
+        valid = ((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)
+        valid &= blocks % (self.max_len + 1) >= min_len
+        if starting_letter:
+            valid &= blocks // (self.max_len + 1) == self.alphabet.indexes[starting_letter]
+        return int(np.count_nonzero(added)) - int(np.count_nonzero(valid))
+
+    def count_bounds(
+        self,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> Tuple[int, int]:
+        # Lower and upper bound of the number of words satisfying the constraints, without scanning the words
+        # Words without the banned letters are counted by inclusion-exclusion over subsets of the banned letters.
+        # The sum is exact if at most COUNT_MAX_LETTERS letters are banned or required in total,
+        # else it is truncated to the letter sets in the count tables, which bounds it from both sides.
+        banned = set(banned_letters or "")
+        required = set(required_letters or "") - {starting_letter}
+        if starting_letter in banned or not banned.isdisjoint(required):
+            return 0, 0
+        if min_len > COUNT_MAX_MIN_LEN or len(required) > COUNT_MAX_LETTERS:
+            return 0, len(self)
+
+        l = self.alphabet.indexes[starting_letter] if starting_letter else len(self.alphabet)
+        row = self.counts[l, max(min_len, 1) - 1]
+        max_order = min(len(banned), COUNT_MAX_LETTERS - len(required))
+        partial_sums = []
+        total = 0
+        for order in range(max_order + 1):
+            terms = sum(
+                int(row[self.alphabet.get_letter_set_id(required.union(c))]) for c in combinations(banned, order)
+            )
+            total += -terms if order % 2 else terms
+            partial_sums.append(total)
+        if max_order == len(banned):
+            lower = upper = partial_sums[-1]
+        else:
+            # Truncating after an odd order gives a lower bound, after an even order an upper bound
+            lower = max(partial_sums[max_order - (max_order + 1) % 2], 0) if max_order else 0
+            upper = partial_sums[max_order - max_order % 2]
+        changes = self._count_changes(min_len, starting_letter, banned, required)
+        return max(lower + changes, 0), upper + changes
+
+    def count(
+        self,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> int:
+        # Number of words satisfying the constraints, scans the candidate words if the count tables are not exact
+        lower, upper = self.count_bounds(min_len, starting_letter, banned_letters, required_letters)
+        if lower == upper:
+            return lower
+        banned = set(banned_letters or "")
+        required = set(required_letters or "")
+        banned_mask = self.alphabet.get_mask(banned)
+        required_mask = self.alphabet.get_mask(required)
+        total = 0
+        for start, end in self.get_ranges(min_len, starting_letter):
+            masks = self.masks[start:end]
+            total += int(np.count_nonzero(((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)))
+        return total + self._count_changes(min_len, starting_letter, banned, required)
+
+    def has_at_least(
+        self,
+        n: int,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> bool:
+        lower, upper = self.count_bounds(min_len, starting_letter, banned_letters, required_letters)
+        if lower >= n or upper < n:
+            return lower >= n
+        return self.count(min_len, starting_letter, banned_letters, required_letters) >= n
+
+    def search(
+        self,
+        pattern: str,
+        min_len: int = 1,
+        max_len: Optional[int] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        # Ordinals of words matching a wildcard pattern ("?" is any letter, "*" is any number of letters)
+        # Built words are matched by comparing letter columns of each block: every record in a block has
+        # the same length, so the letters before the first "*" and after the last "*" are at fixed positions.
+        # Segments between "*" are matched leftmost first, each starting after the end of the previous one.
+        if not pattern or not all(c in self.alphabet.indexes or c in "?*" for c in pattern):
+            return np.empty(0, dtype=np.int64)
+        segments = pattern.split("*")
+        head, tail = segments[0], segments[-1] if len(segments) > 1 else ""
+        middles = [segment for segment in segments[1:-1] if segment]
+        pattern_len = len(pattern) - len(segments) + 1
+        if len(segments) == 1:  # No "*", length is fixed
+            max_len = min(max_len or pattern_len, pattern_len)
+        min_len = max(min_len, pattern_len, 1)
+        banned_mask = self.alphabet.get_mask(banned_letters or "")
+        required_mask = self.alphabet.get_mask(set(required_letters or "") | set(pattern) - set("?*"))
+        codes = {c: self.alphabet.encode(c)[0] for c in set(pattern) - set("?*")}
+        head_columns = [(i, codes[c]) for i, c in enumerate(head) if c != "?"]
+        tail_columns = [(i - len(tail), codes[c]) for i, c in enumerate(tail) if c != "?"]
+
+        parts = []
+        for letter in self.alphabet.letters if head[:1] in ("", "?") else head[0]:
+            # Added words may be longer than the longest built word, so only the block scan is capped
+            for n in range(min_len, min(max_len or self.max_len, self.max_len) + 1):
+                block = self._get_block(letter, n)
+                start, end = self.block_starts[block], self.block_starts[block + 1]
+                if start == end:
+                    continue
+                records = np.frombuffer(
+                    self.buffer, dtype=np.uint8, count=(end - start) * n, offset=self.block_byte_starts[block]
+                ).reshape(-1, n)
+                masks = self.masks[start:end]
+                valid = ((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)
+                for i, c in head_columns + [(n + i, c) for i, c in tail_columns]:
+                    valid &= records[:, i] == c
+                ordinals = np.flatnonzero(valid) + start
+
+                records = records[valid]
+                # Where the next segment may start, past the end of the word if a segment was not found
+                next_start = np.full(len(records), len(head))
+                for segment in middles:
+                    segment_end = np.full(len(records), n + 1)
+                    for p in range(len(head), n - len(tail) - len(segment) + 1):
+                        found = (segment_end > n) & (next_start <= p)
+                        for i, c in enumerate(segment):
+                            if c != "?":
+                                found &= records[:, p + i] == codes[c]
+                        segment_end[found] = p + len(segment)
+                    next_start = segment_end
+                parts.append(ordinals[next_start <= n])
+        if self.extra_words:
+            regex = re.compile(".*".join(re.escape(segment).replace(r"\?", ".") for segment in segments))
+            starting_letter = head[0] if head[:1] not in ("", "?") else None
+            valid = self._match_extra(min_len, starting_letter, banned_mask, required_mask)
+            if max_len:
+                valid &= self.extra_lengths <= max_len
+            parts.append(np.array([
+                len(self.masks) + i for i in np.flatnonzero(valid).tolist() if regex.fullmatch(self.extra_words[i])
+            ], dtype=np.int64))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return self._without_removed(np.concatenate(parts))
+
+    def suggest(
+        self,
+        word: str,
+        limit: int = 3,
+        starting_letter: Optional[str] = None,
+        min_len: int = 1,
+        exclude_words: Optional[Set[str]] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letter: Optional[str] = None,
+    ) -> List[str]:
+        # Closest words within SUGGEST_MAX_DISTANCE edits of word satisfying the constraints, nearest first
+        word = self.alphabet.normalize(word)
+        if not self.alphabet.is_word(word):
+            return []
+        banned_mask = self.alphabet.get_mask(banned_letters or "")
+        required_mask = self.alphabet.get_mask(required_letter or "")
+        keys = np.array(self.alphabet.get_delete_keys(word), dtype=np.uint64) << np.uint64(SUGGEST_ORDINAL_BITS)
+        starts = np.searchsorted(self.deletes, keys).tolist()
+        ends = np.searchsorted(self.deletes, keys + np.uint64(1 << SUGGEST_ORDINAL_BITS)).tolist()
+        entries = np.concatenate([self.deletes[start:end] for start, end in zip(starts, ends)])
+        ordinals = np.unique(entries & np.uint64((1 << SUGGEST_ORDINAL_BITS) - 1)).astype(np.int64)
+
+        # Cheap filters before computing edit distances:
+        # lengths differ by at most one per edit and each edit changes the presence of at most two letters
+        lengths = (np.searchsorted(self.block_starts, ordinals, side="right") - 1) % (self.max_len + 1)
+        masks = self.masks[ordinals]
+        changed_letters = np.unpackbits(
+            (masks ^ np.uint32(self.alphabet.get_mask(word))).view(np.uint8).reshape(-1, 4), axis=1
+        ).sum(axis=1)
+        candidates = self.get_words_at(self._without_removed(ordinals[
+            (np.abs(lengths - len(word)) <= SUGGEST_MAX_DISTANCE)
+            & (changed_letters <= 2 * SUGGEST_MAX_DISTANCE)
+            & (lengths >= min_len)
+            & ((masks & banned_mask) == 0)
+            & ((masks & required_mask) == required_mask)
+        ]))
+        if self.extra_words:
+            _, extra_kept = self._get_removed()
+            changed_letters = np.unpackbits(
+                (self.extra_masks ^ np.uint32(self.alphabet.get_mask(word))).view(np.uint8).reshape(-1, 4), axis=1
+            ).sum(axis=1)
+            valid = self._match_extra(min_len, None, banned_mask, required_mask) & extra_kept
+            valid &= (np.abs(self.extra_lengths - len(word)) <= SUGGEST_MAX_DISTANCE)
+            valid &= changed_letters <= 2 * SUGGEST_MAX_DISTANCE
+            candidates += [self.extra_words[i] for i in np.flatnonzero(valid).tolist()]
+
+        suggestions = []
+        for candidate in candidates:
+            if candidate == word or starting_letter and candidate[0] != starting_letter or len(candidate) < min_len:
+                continue
+            if exclude_words and candidate in exclude_words:
+                continue
+            distance = get_edit_distance(word, candidate, SUGGEST_MAX_DISTANCE)
+            if distance <= SUGGEST_MAX_DISTANCE:
+                suggestions.append((distance, candidate))
+        return [w for _, w in sorted(suggestions)[:limit]]
+
+    def sample(
+        self,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letter: Optional[str] = None,
+        tag: Optional[str] = None,
+        excluded: Optional[np.ndarray] = None,
+        safe_only: bool = False,
+    ) -> Iterator[int]:
+        # Ordinals drawn uniformly with replacement from the words satisfying the constraints
+        # and not in the excluded bitset, see filter
+        # Draws are made from the candidate ranges and rejected if invalid, so valid words are never listed.
+        # Stops after SAMPLING_ROUNDS * SAMPLES_PER_ROUND draws, callers should then fall back to filter.
+        ranges = self.get_ranges(min_len, starting_letter)
+        if self.extra_words:
+            ranges.append((len(self.masks), len(self.masks) + len(self.extra_words)))
+        ranges = [(start, end) for start, end in ranges if start < end]
+        if not ranges:
+            return
+        starts = np.array([start for start, _ in ranges])
+        sizes = np.array([end - start for start, end in ranges])
+        # Where each range begins and ends when the ranges are concatenated
+        range_ends = np.cumsum(sizes)
+        range_starts = range_ends - sizes
+        banned_mask = self.alphabet.get_mask(banned_letters or "")
+        required_mask = self.alphabet.get_mask(required_letter or "")
+
+        for _ in range(SAMPLING_ROUNDS):
+            draws = rng.integers(range_ends[-1], size=SAMPLES_PER_ROUND)
+            range_idx = np.searchsorted(range_ends, draws, side="right")
+            ordinals = starts[range_idx] + draws - range_starts[range_idx]
+            masks = self.get_masks(ordinals)
+            valid = ((masks & banned_mask) == 0) & ((masks & required_mask) == required_mask)
+            if tag:
+                valid &= self.has_tag(tag, ordinals)
+            if excluded is not None:
+                valid &= ~test_bits(excluded, ordinals)
+            if safe_only:
+                valid &= ~test_bits(self.unsafe, ordinals)
+            for o in ordinals[valid].tolist():
+                if o in self.removed:
+                    continue
+                if o >= len(self.masks) and not self._satisfies(self[o], min_len, starting_letter):
+                    continue
+                yield o
+
+
+class WordOverlay:
+    # Words added to and removed from the shared word index for one group
+    # Only the differences are stored, so the index is never copied per group.
+
+    def __init__(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        self.added: Set[str] = set(added)
+        self.removed: Set[str] = set(removed)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def contains(self, index: WordIndex, word: str) -> bool:
+        return word not in self.removed and (word in self.added or word in index)
+
+    @staticmethod
+    def get_matching(
+        words: Iterable[str],
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        banned = set(banned_letters or "")
+        required = set(required_letters or "")
+        return [
+            w for w in words
+            if len(w) >= min_len and (not starting_letter or w[0] == starting_letter)
+            and not banned & set(w) and required <= set(w)
+        ]
+
+    def count_difference(
+        self,
+        index: WordIndex,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letters: Optional[Iterable[str]] = None,
+    ) -> int:
+        # Difference between the number of words satisfying the constraints with and without the overlay
+        constraints = (min_len, starting_letter, banned_letters, required_letters)
+        added = sum(w not in index for w in self.get_matching(self.added, *constraints))
+        removed = sum(w in index for w in self.get_matching(self.removed, *constraints))
+        return added - removed
+
+
+class AliasTable:
+    # Walker's alias method, draws index i with probability weights[i] / sum(weights) in O(1)
+    # Each slot holds its own index with probability prob[slot] and the alias index otherwise.
+
+    def __init__(self, weights: np.ndarray) -> None:
+        n = len(weights)
+        prob = (weights * (n / weights.sum())).tolist()
+        alias = list(range(n))
+        small = [i for i, p in enumerate(prob) if p < 1]
+        large = [i for i, p in enumerate(prob) if p >= 1]
+        while small and large:
+            s, l = small.pop(), large[-1]
+            alias[s] = l
+            prob[l] -= 1 - prob[s]
+            if prob[l] < 1:
+                small.append(large.pop())
+        for i in small + large:  # Left over by rounding errors only
+            prob[i] = 1
+        self.prob = np.array(prob, dtype=np.float32)
+        self.alias = np.array(alias, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, size: int) -> np.ndarray:
+        slots = rng.integers(len(self.prob), size=size)
+        return np.where(rng.random(size, dtype=np.float32) < self.prob[slots], slots, self.alias[slots])
+
+
+class WordSampler:
+    # Draws words weighted by how often players have used them, see WORD_WEIGHTINGS
+    # Only words used at least once can be drawn. Words are kept as strings rather than ordinals,
+    # so the sampler stays valid when the word index is reloaded, and callers must check that drawn words exist.
+
+    def __init__(self, counts: Dict[str, int], alphabet: Alphabet, previous: Optional["WordSampler"] = None) -> None:
+        # With previous, counts holds all words of the starting letters whose counts changed only,
+        # and the tables of the other letters are taken from previous
+        self.alphabet = alphabet
+        self.words: Dict[Optional[str], List[str]] = {}
+        self.lengths: Dict[Optional[str], np.ndarray] = {}
+        self.masks: Dict[Optional[str], np.ndarray] = {}
+        self.counts: Dict[Optional[str], np.ndarray] = {}
+        self.tables: Dict[Tuple[Optional[str], str], AliasTable] = {}
+        # Tables of the words of each starting letter, then of all words under key None
+        for word in sorted(counts):
+            self.words.setdefault(word[0], []).append(word)
+        for key, group in self.words.items():
+            self.lengths[key] = np.array([len(w) for w in group], dtype=np.int32)
+            self.masks[key] = np.array([alphabet.get_mask(w) for w in group], dtype=np.uint32)
+            self.counts[key] = np.array([counts[w] for w in group], dtype=np.float64)
+            self._build_tables(key)
+        if previous:
+            for key in previous.words.keys() - self.words.keys() - {None}:
+                self.words[key], self.lengths[key] = previous.words[key], previous.lengths[key]
+                self.masks[key], self.counts[key] = previous.masks[key], previous.counts[key]
+                for weighting in WORD_WEIGHTINGS:
+                    self.tables[key, weighting] = previous.tables[key, weighting]
+
+        # Words of each letter are sorted, so concatenating the letters in order keeps all words sorted
+        letters = sorted(self.words)
+        self.words[None] = [w for letter in letters for w in self.words[letter]]
+        for arrays in (self.lengths, self.masks, self.counts):
+            arrays[None] = np.concatenate([arrays[letter] for letter in letters])
+        self._build_tables(None)
+
+    def _build_tables(self, key: Optional[str]) -> None:
+        for weighting, get_weights in WORD_WEIGHTINGS.items():
+            self.tables[key, weighting] = AliasTable(get_weights(self.counts[key]))
+
+    def __len__(self) -> int:
+        return len(self.words[None])
+
+    def sample(
+        self,
+        weighting: str,
+        min_len: int = 1,
+        starting_letter: Optional[str] = None,
+        banned_letters: Optional[Iterable[str]] = None,
+        required_letter: Optional[str] = None,
+    ) -> Iterator[str]:
+        # Words drawn with replacement, rejected if they do not satisfy the constraints
+        # Stops after SAMPLING_ROUNDS * SAMPLES_PER_ROUND draws like WordIndex.sample.
+        key = starting_letter or None
+        if key not in self.words:
+            return
+        words, lengths, masks = self.words[key], self.lengths[key], self.masks[key]
+        table = self.tables[key, weighting]
+        banned_mask = self.alphabet.get_mask(banned_letters or "")
+        required_mask = self.alphabet.get_mask(required_letter or "")
+        for _ in range(SAMPLING_ROUNDS):
+            draws = table.draw(SAMPLES_PER_ROUND)
+            valid = (
+                (lengths[draws] >= min_len)
+                & ((masks[draws] & banned_mask) == 0)
+                & ((masks[draws] & required_mask) == required_mask)
+            )
+            for i in draws[valid].tolist():
+                yield words[i]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a word snapshot from a file with one word per line")
+    parser.add_argument("words_path")
+    parser.add_argument("snapshot_path")
+    parser.add_argument("--removed", help="file with words to exclude, one per line")
+    parser.add_argument("--manifest", default="{}", help="source manifest as JSON")
+    parser.add_argument("--language", default="en", choices=ALPHABETS)
+    parser.add_argument("--blocklist", help="file with strings words must not contain to be said by the bot, one per line")
+    args = parser.parse_args()
+    print(
+        build_snapshot(
+            args.words_path, args.snapshot_path, args.removed, json.loads(args.manifest), args.language, args.blocklist
+        )
+    )